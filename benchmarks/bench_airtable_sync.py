@@ -0,0 +1,73 @@
+"""
+Benchmarks the batched Airtable sync against a local stand-in server.
+
+    python benchmarks/bench_airtable_sync.py [number_of_events]
+
+The old per-event GET + PATCH/POST approach cost about 2N requests for N events;
+the batched upsert should need ceil(N / 10), and an indexed re-sync of unchanged
+events only the ceil(N / 100) list requests. Exits with status 1 if the request counts
+or the per-record statuses differ from these expectations.
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inseadevent  # noqa: E402
+from stand_in import AIRTABLE_PATH, start_airtable_stand_in  # noqa: E402
+
+
+def synthetic_events(count):
+    return [{
+        'event': f"Synthetic Event {i}",
+        'Month & Day': '2025-06-10',
+        'location': 'Singapore' if i % 2 else 'Fontainebleau',
+        'eventurl': f"https://www.insead.edu/events/synthetic-{i}",
+        'Added At': '2025-06-01 03:00:00',
+        'AsiaRelated': bool(i % 2),
+        'custom_unique_id': f"syntheticevent{i}-https://www.insead.edu/events/synthetic-{i}"
+    } for i in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    server = start_airtable_stand_in()
+    inseadevent.AIRTABLE_API_URL = server.base_url + AIRTABLE_PATH
+    records = [inseadevent.prepare_airtable_record(event) for event in synthetic_events(count)]
+
+    writes = math.ceil(count / inseadevent.AIRTABLE_BATCH_SIZE)
+    # (label, use the index, expected status of every record, expected PATCHes, expected GETs)
+    scenarios = (("initial sync", False, 'created', writes, 0),
+                 ("re-sync", False, 'updated', writes, 0),
+                 ("indexed re-sync", True, 'unchanged', 0, math.ceil(count / inseadevent.AIRTABLE_PAGE_SIZE)))
+    failures = 0
+    for label, use_index, expected_status, expected_writes, expected_reads in scenarios:
+        before = server.total_requests
+        counts_before = dict(server.request_counts)
+        start = time.perf_counter()
+        index = inseadevent.fetch_airtable_index(inseadevent.airtable_index_field_keys()) if use_index else None
+        results = inseadevent.sync_airtable_records(records, index=index)
+        elapsed = time.perf_counter() - start
+        statuses = {s: sum(1 for r in results if r['status'] == s) for s in ('created', 'updated', 'unchanged', 'failed')}
+        print(f"{label}: {count} events, {server.total_requests - before} requests "
+              f"(per-event baseline: {2 * count}), {elapsed:.3f}s, {statuses}")
+
+        delta = {key: value - counts_before.get(key, 0) for key, value in server.request_counts.items()}
+        requests_made = {method: sum(value for key, value in delta.items() if key.startswith(method + " "))
+                         for method in ('PATCH', 'GET')}
+        if requests_made != {'PATCH': expected_writes, 'GET': expected_reads}:
+            failures += 1
+            print(f"MISMATCH {label}: expected {expected_writes} PATCH and {expected_reads} GET requests, "
+                  f"got {requests_made['PATCH']} PATCH and {requests_made['GET']} GET")
+        if statuses[expected_status] != count or len(results) != count:
+            failures += 1
+            print(f"MISMATCH {label}: expected all {count} records {expected_status}, got {statuses}")
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
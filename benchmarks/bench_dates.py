@@ -0,0 +1,96 @@
+"""
+Checks parse_date_range against the fixture corpus and micro-benchmarks it.
+
+    python benchmarks/bench_dates.py [repetitions]
+
+Exits non-zero if any string in benchmarks/fixtures/dates.tsv parses differently,
+then compares the original strptime-based parser with the compiled parser,
+both uncached and memoized.
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from eventdates import parse_date_range  # noqa: E402
+
+
+def legacy_parse_date(date_str):
+    """
+    The strptime-based parse_date this module replaced, kept as the benchmark baseline.
+    """
+    if not date_str:
+        return None
+    date_str = ' '.join(date_str.split())
+    date_patterns = [
+        (r'(\d{1,2})\s+([A-Za-z]+)\s+\'?(\d{2})\s*-\s*\d{1,2}\s+[A-Za-z]+\s+\'?\d{2}', True, '%d %b %Y'),
+        (r'(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]+)\s+\'?(\d{2})', True, '%d %b %Y'),
+        (r'(\d{1,2}\s+[A-Za-z]+\s+\d{4},\s+\d{1,2}:\d{2}\s+[ap]m)', False, '%d %B %Y, %I:%M %p'),
+        (r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})', False, '%d %B %Y'),
+        (r'(\d{1,2}\s+[A-Za-z]+\s+\'?\d{2})', False, '%d %b %Y'),
+    ]
+    for pattern, is_range, date_format in date_patterns:
+        match = re.search(pattern, date_str)
+        if match:
+            try:
+                if is_range:
+                    if len(match.groups()) == 4:
+                        temp_date_str = f"{match.group(1)} {match.group(3)} 20{match.group(4)}"
+                    else:
+                        temp_date_str = f"{match.group(1)} {match.group(2)} 20{match.group(3)}"
+                else:
+                    temp_date_str = match.group(1)
+                if "'" in temp_date_str:
+                    temp_date_str = temp_date_str.replace("'", "20")
+                return datetime.strptime(temp_date_str, date_format).strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+    return None
+
+
+def load_corpus():
+    corpus = []
+    with open(os.path.join(BENCH_DIR, "fixtures", "dates.tsv"), encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            text, start, end = line.rstrip("\n").split("\t")
+            corpus.append((text, None if start == "-" else start, None if end == "-" else end))
+    return corpus
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = load_corpus()
+
+    failures = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        parsed = [parse_date_range(text) for text, _, _ in corpus]
+    for (text, start, end), result in zip(corpus, parsed):
+        if result != (start, end):
+            print(f"MISMATCH {text!r}: expected {(start, end)}, got {result}")
+            failures += 1
+    print(f"{len(corpus) - failures}/{len(corpus)} corpus strings parsed as expected")
+
+    strings = [text for text, _, _ in corpus if text.strip()] * repetitions
+    uncached = parse_date_range.__wrapped__
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, parser in (("legacy strptime", legacy_parse_date), ("compiled, uncached", uncached),
+                              ("compiled, memoized", parse_date_range)):
+            start = time.perf_counter()
+            for text in strings:
+                parser(text)
+            elapsed = time.perf_counter() - start
+            sys.__stdout__.write(f"{label:<20} {len(strings) / elapsed:>12,.0f} strings/s\n")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmarks cross-source deduplication: merge time per sighting and memory held by the index.
+
+    python benchmarks/bench_dedup.py [number_of_events] [number_of_sources]
+
+Every source lists every event, with the URL variants a real crawl sees (query strings,
+trailing slashes, title spacing), so the index should end up with exactly one entry per event.
+The memory of the DedupIndex (slots records) is compared with keeping the event dicts.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inseadevent  # noqa: E402
+from eventdedup import DedupIndex  # noqa: E402
+
+URL_VARIANTS = ("{}", "{}/", "{}?utm_source=newsletter", "{}#register")
+
+
+def sightings(count, sources):
+    added_at = '2025-06-01 03:00:00'
+    for source in range(sources):
+        for i in range(count):
+            title = f"Synthetic  Event {i}" if source % 2 else f"Synthetic Event {i}"
+            link = URL_VARIANTS[(i + source) % len(URL_VARIANTS)].format(f"/events/synthetic-event-{i}")
+            event = inseadevent.build_event(title, link, f"{i % 28 + 1:02d} Jun '25", "Singapore" if source else "", added_at)
+            event['sources'] = [f"source-{source}"]
+            yield event
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sources = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    events = list(sightings(count, sources))
+
+    dedup = DedupIndex()
+    start = time.perf_counter()
+    for event in events:
+        dedup.add(event)
+    elapsed = time.perf_counter() - start
+    del dedup
+
+    tracemalloc.start() # Measured on a second pass, as tracing slows the merge down
+    before = tracemalloc.get_traced_memory()[0]
+    dedup = DedupIndex()
+    for event in events:
+        dedup.add(event)
+    index_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    before = tracemalloc.get_traced_memory()[0]
+    copies = {event['custom_unique_id']: dict(event) for event in events}
+    dict_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{len(events)} sightings from {sources} sources -> {len(dedup)} unique events (expected {count})")
+    print(f"merge: {elapsed:.3f}s, {elapsed / len(events) * 1e6:.1f} us per sighting")
+    print(f"memory: DedupIndex {index_bytes / len(dedup):.0f} B per event, "
+          f"event dicts {dict_bytes / len(copies):.0f} B per event")
+
+
+if __name__ == "__main__":
+    main()
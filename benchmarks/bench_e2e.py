@@ -0,0 +1,117 @@
+"""
+End-to-end benchmark: runs the full inseadevent.py __main__ against a local stand-in
+serving both the INSEAD listing and the Airtable table.
+
+    python benchmarks/bench_e2e.py --events 100 1000 5000
+    python benchmarks/bench_e2e.py --replay recordings/ --latency 0.2 --error-rate 0.05
+    python benchmarks/bench_e2e.py --events 1000 --sources 3
+
+The listing is either synthetic (scaled to --events cards) or replayed from a directory
+captured on a live run with INSEAD_RECORD_DIR=recordings/ python inseadevent.py.
+With --sources N, N - 1 extra synthetic listings are crawled in the same run through
+INSEAD_SOURCES, each sharing half of its events with the one before.
+Each scenario is run --runs times against the same stand-in, so later runs show the
+steady state (index or event store lookups, no writes). Reports wall time, request
+counts and the peak RSS of the scraper process.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import inseadevent  # noqa: E402
+from stand_in import RecordedListing, SyntheticListing, start_site_stand_in  # noqa: E402
+
+
+def run_scraper(env):
+    """
+    Runs inseadevent.py once and returns (wall seconds, exit code, peak RSS in MiB).
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, "inseadevent.py")], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        sys.stderr.write(process.stderr.read().decode()[-2000:])
+    return elapsed, process.returncode, usage.ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+
+
+def write_sources(path, count):
+    """
+    Writes an INSEAD_SOURCES file for the events listing and count - 1 extra listings.
+    """
+    sources = [{"name": "events", "listing_path": "/events/listing", "view_name": "events_listing"}]
+    sources += [{"name": f"source-{k}", "listing_path": f"/source-{k}/listing", "view_name": f"source_{k}"}
+                for k in range(1, count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"sources": sources}, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[100, 1000],
+                        help="synthetic listing sizes to run")
+    parser.add_argument("--replay", help="directory of recorded exchanges to replay instead")
+    parser.add_argument("--sources", type=int, default=1, help="synthetic listings crawled per run")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of AJAX requests failing with 503")
+    parser.add_argument("--runs", type=int, default=2, help="runs per scenario")
+    parser.add_argument("--store", action="store_true", help="enable the SQLite event store")
+    parser.add_argument("--fetch-rate", default="50", help="INSEAD_FETCH_RATE for the runs")
+    parser.add_argument("--concurrency", default="8", help="INSEAD_FETCH_CONCURRENCY for the runs")
+    parser.add_argument("--airtable-rate", default="50", help="AIRTABLE_RATE for the runs")
+    args = parser.parse_args()
+
+    if args.replay:
+        scenarios = [(f"replay {args.replay}", RecordedListing(args.replay))]
+    else:
+        scenarios = [(f"{count} synthetic events" + (f" x{args.sources}" if args.sources > 1 else ""), SyntheticListing(count))
+                     for count in args.events]
+
+    print(f"{'scenario':<28} {'run':>3} {'wall s':>8} {'INSEAD req':>10} {'Airtable req':>12} {'peak RSS MiB':>12}")
+    for label, listing in scenarios:
+        server = start_site_stand_in(listing, args.latency, args.error_rate,
+                                     inseadevent.AIRTABLE_FIELDS['Event Unique ID'])
+        sources = 1 if args.replay else args.sources
+        for k in range(1, sources):
+            count = len(listing.events)
+            server.extra_listings[f"/source-{k}/listing"] = SyntheticListing(count, first=k * count // 2)
+        with tempfile.TemporaryDirectory() as state_dir:
+            if sources > 1:
+                write_sources(os.path.join(state_dir, "sources.json"), sources)
+            env = dict(os.environ,
+                       INSEAD_BASE_URL=server.base_url,
+                       AIRTABLE_API_URL=server.base_url + server.airtable_path,
+                       AIRTABLE_API_KEY="stand-in",
+                       INSEAD_HTTP_CACHE=os.path.join(state_dir, "http_cache.json"),
+                       INSEAD_EVENT_STORE=os.path.join(state_dir, "store.sqlite3") if args.store else "",
+                       INSEAD_RUN_REPORT=os.path.join(state_dir, "run_report.json"),
+                       INSEAD_RECORD_DIR="",
+                       INSEAD_SOURCES=os.path.join(state_dir, "sources.json") if sources > 1 else "",
+                       INSEAD_FETCH_RATE=args.fetch_rate,
+                       INSEAD_FETCH_BURST=args.concurrency,
+                       INSEAD_FETCH_CONCURRENCY=args.concurrency,
+                       INSEAD_FETCH_BACKOFF="0.05",
+                       AIRTABLE_RATE=args.airtable_rate)
+            for run in range(1, args.runs + 1):
+                before = dict(server.request_counts)
+                elapsed, returncode, peak_rss = run_scraper(env)
+                delta = {key: count - before.get(key, 0) for key, count in server.request_counts.items()}
+                airtable = sum(count for key, count in delta.items() if " /v0/" in key)
+                insead = sum(delta.values()) - airtable
+                failed = "" if returncode == 0 else f"  (exit code {returncode})"
+                print(f"{label:<28} {run:>3} {elapsed:>8.2f} {insead:>10} {airtable:>12} {peak_rss:>12.1f}{failed}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
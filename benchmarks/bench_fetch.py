@@ -0,0 +1,58 @@
+"""
+Benchmarks AJAX page fetching against a local INSEAD stand-in that injects latency.
+
+    python benchmarks/bench_fetch.py [number_of_events] [latency_seconds]
+
+Compares a sequential crawl at the old pace (one page at a time, one request every
+two seconds) with the concurrent, rate-limited scheduler. Each configuration crawls
+twice, so the second run shows the main page being revalidated with a 304.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inseadevent  # noqa: E402
+from stand_in import start_insead_stand_in  # noqa: E402
+
+CONFIGURATIONS = [
+    ("sequential, 0.5 req/s", dict(FETCH_CONCURRENCY=1, FETCH_PREFETCH_PAGES=1, FETCH_RATE=0.5, FETCH_BURST=1)),
+    ("sequential, 2 req/s", dict(FETCH_CONCURRENCY=1, FETCH_PREFETCH_PAGES=1, FETCH_RATE=2, FETCH_BURST=1)),
+    ("4 workers, 4 req/s", dict(FETCH_CONCURRENCY=4, FETCH_PREFETCH_PAGES=4, FETCH_RATE=4, FETCH_BURST=2)),
+    ("8 workers, 8 req/s", dict(FETCH_CONCURRENCY=8, FETCH_PREFETCH_PAGES=8, FETCH_RATE=8, FETCH_BURST=8)),
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+
+    for label, settings in CONFIGURATIONS:
+        server = start_insead_stand_in(event_count=count, latency=latency, error_rate=0.1)
+        inseadevent.MAIN_URL = server.base_url + "/events/listing"
+        inseadevent.AJAX_URL = server.base_url + "/views/ajax"
+        inseadevent.FETCH_BACKOFF = 0.05
+        for name, value in settings.items():
+            setattr(inseadevent, name, value)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            inseadevent.HTTP_CACHE_PATH = os.path.join(cache_dir, "http_cache.json")
+            inseadevent._conditional_cache = None
+            for run in ("cold", "warm"):
+                inseadevent._response_cache.clear()
+                before = server.total_requests
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    events = inseadevent.fetch_all_events_hybrid()
+                elapsed = time.perf_counter() - start
+                print(f"{label} ({run}): {len(events)}/{count} events, {server.total_requests - before} requests, {elapsed:.2f}s")
+        print(f"    main page requests: {server.request_counts['GET /events/listing']} over both runs")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmarks event card extraction with every installed parser backend.
+
+    python benchmarks/bench_parser.py [repetitions]
+
+Parses the saved fixture pages in benchmarks/fixtures/ plus a synthetic 500-card
+page and a UTF-8 encoded fragment with non-ASCII text (given as bytes, without a
+charset declaration), checks that every backend extracts the same events as bs4,
+and reports cards parsed per second.
+"""
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import inseadevent  # noqa: E402
+from stand_in import render_cards, synthetic_listing  # noqa: E402
+
+
+def load_pages():
+    with open(os.path.join(BENCH_DIR, "fixtures", "main_page.html"), encoding="utf-8") as f:
+        main_page = f.read()
+    with open(os.path.join(BENCH_DIR, "fixtures", "ajax_page.json"), encoding="utf-8") as f:
+        ajax_page = "".join(item["data"] for item in json.load(f) if isinstance(item.get("data"), str))
+    return {
+        "main page fixture": main_page,
+        "AJAX fixture": ajax_page,
+        "synthetic 500 cards": render_cards(synthetic_listing(500)),
+        "UTF-8 bytes fragment": render_cards(synthetic_listing(50, ("Zürich", "São Paulo", "Besançon", "北京"))).encode()
+    }
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = load_pages()
+
+    for page_name, html in pages.items():
+        expected = list(inseadevent.extract_events(html, "bench", "bs4"))
+        print(f"{page_name}: {len(expected)} cards, {len(html) // 1024} KiB")
+        for backend in inseadevent.PARSER_BACKENDS:
+            if backend not in inseadevent.available_parser_backends():
+                print(f"    {backend:<10} not installed")
+                continue
+            events = list(inseadevent.extract_events(html, "bench", backend))
+            if events != expected:
+                print(f"    {backend:<10} MISMATCH against bs4 output")
+                continue
+            start = time.perf_counter()
+            for _ in range(repetitions):
+                for _ in inseadevent.extract_events(html, "bench", backend):
+                    pass
+            elapsed = time.perf_counter() - start
+            print(f"    {backend:<10} {len(expected) * repetitions / elapsed:>10,.0f} cards/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compares the streaming fetch -> sync pipeline with crawling everything before writing.
+
+    python benchmarks/bench_pipeline.py [number_of_events] [latency_seconds]
+
+Both INSEAD and Airtable stand-ins add the given latency to every request. Reports
+the time until the first Airtable write and the total wall time of each approach.
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inseadevent  # noqa: E402
+from stand_in import AIRTABLE_PATH, start_airtable_stand_in, start_insead_stand_in  # noqa: E402
+
+
+def materialise_then_write():
+    events = inseadevent.fetch_all_events_hybrid()
+    records = [inseadevent.prepare_airtable_record(event) for event in events]
+    return len(inseadevent.sync_airtable_records(records))
+
+
+def streaming():
+    events = inseadevent.aiter_source_events([inseadevent.DEFAULT_SOURCE])
+    return sum(asyncio.run(inseadevent.sync_events_async(events, None, {})).values())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    inseadevent.HTTP_CACHE_PATH = ""
+
+    for label, run in (("materialise then write", materialise_then_write), ("streaming", streaming)):
+        insead = start_insead_stand_in(event_count=count, latency=latency)
+        airtable = start_airtable_stand_in(latency=latency)
+        inseadevent.MAIN_URL = insead.base_url + "/events/listing"
+        inseadevent.AJAX_URL = insead.base_url + "/views/ajax"
+        inseadevent.AIRTABLE_API_URL = airtable.base_url + AIRTABLE_PATH
+        inseadevent._response_cache.clear()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = run()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {records} records, first write after {airtable.first_write_at - start:.2f}s, "
+              f"total {elapsed:.2f}s")
+        insead.shutdown()
+        airtable.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Checks the region classifier against the fixture corpus and micro-benchmarks it.
+
+    python benchmarks/bench_regions.py [repetitions]
+
+Exits non-zero if any location in benchmarks/fixtures/locations.tsv is classified
+differently, then compares the original keyword scan behind is_asia_related with the
+compiled classifier, both uncached and memoized.
+"""
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from eventregions import PLACE_REGIONS, classify_location, is_asia_related  # noqa: E402
+
+
+def legacy_is_asia_related(location):
+    """
+    The substring scan is_asia_related used before, kept as the benchmark baseline.
+    """
+    if not location:
+        return False
+    asia_keywords = ['asia', 'singapore', 'china', 'japan', 'korea', 'india', 'indonesia', 'malaysia', 'thailand', 'vietnam']
+    return any(keyword in location.lower() for keyword in asia_keywords)
+
+
+def load_corpus():
+    corpus = []
+    with open(os.path.join(BENCH_DIR, "fixtures", "locations.tsv"), encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            text, regions, asia = line.rstrip("\n").split("\t")
+            corpus.append((text, () if regions == "-" else tuple(regions.split(",")), asia == "True"))
+    return corpus
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = load_corpus()
+
+    failures = 0
+    for text, regions, asia in corpus:
+        result = (classify_location(text), is_asia_related(text))
+        if result != (regions, asia):
+            print(f"MISMATCH {text!r}: expected {(regions, asia)}, got {result}")
+            failures += 1
+    legacy_misses = sum(1 for text, _, asia in corpus if legacy_is_asia_related(text) != asia)
+    print(f"{len(corpus) - failures}/{len(corpus)} corpus locations classified as expected "
+          f"(legacy keyword scan: {len(corpus) - legacy_misses}/{len(corpus)} AsiaRelated correct); "
+          f"{len(PLACE_REGIONS)} places in the table")
+
+    locations = [text for text, _, _ in corpus] * repetitions
+    for label, classifier in (("legacy keyword scan", legacy_is_asia_related),
+                              ("compiled, uncached", classify_location.__wrapped__),
+                              ("compiled, memoized", classify_location)):
+        start = time.perf_counter()
+        for text in locations:
+            classifier(text)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20} {len(locations) / elapsed:>12,.0f} locations/s")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
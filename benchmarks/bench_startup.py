@@ -0,0 +1,63 @@
+"""
+Startup benchmark: checks the import time of inseadevent against a budget.
+
+    python benchmarks/bench_startup.py [--budget-ms 120] [--runs 7] [--zipapp inseadevent.pyz]
+
+Imports inseadevent in fresh interpreters under python -X importtime and takes the median of
+the cumulative time reported for it, which covers everything it imports eagerly. A first,
+unmeasured run writes the bytecode cache (or measure a zipapp built by build_zipapp.py).
+Exits with status 1 if the median exceeds the budget, listing the slowest imports so that
+a regression can be traced to the module that caused it.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(path, statement="import inseadevent"):
+    """
+    Runs statement in a fresh interpreter with path first on sys.path.
+    Returns {module: (self us, cumulative us)} from -X importtime.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+    code = f"import sys; sys.path.insert(0, {path!r}); {statement}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, cwd=REPO_DIR,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=120, help="largest acceptable median import time")
+    parser.add_argument("--runs", type=int, default=7, help="measured imports")
+    parser.add_argument("--zipapp", help="import inseadevent from this zipapp instead of the source tree")
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.zipapp) if args.zipapp else REPO_DIR
+    interpreter_modules = set(import_times(path, "pass")) # Imported at startup whatever the script
+    import_times(path) # Warm-up run writing the bytecode cache
+    runs = [import_times(path) for _ in range(args.runs)]
+    median_ms = statistics.median(times["inseadevent"][1] for times in runs) / 1000
+
+    modules = {name: statistics.median(times[name][0] for times in runs if name in times)
+               for name in runs[0] if name not in interpreter_modules}
+    print(f"Slowest imports of {args.zipapp or 'inseadevent.py'} (self time, median of {args.runs} runs):")
+    for name, self_us in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print(f"    {name:<40} {self_us / 1000:>7.2f} ms")
+    over_budget = median_ms > args.budget_ms
+    print(f"import inseadevent: {median_ms:.1f} ms (budget {args.budget_ms:g} ms){' OVER BUDGET' if over_budget else ''}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
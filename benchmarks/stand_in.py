@@ -0,0 +1,328 @@
+"""
+Local stand-in HTTP servers used by the benchmark scripts.
+They mimic just enough of the INSEAD events listing and the Airtable API to
+exercise inseadevent.py offline, either from a synthetic listing or by replaying
+exchanges recorded with INSEAD_RECORD_DIR, and count every request they receive.
+"""
+import hashlib
+import html
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+AIRTABLE_PATH = "/v0/appStandIn/tblStandIn"
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server that records request counts by method and path.
+    Handlers read their configuration (listing, latency, error rate, Airtable table) from it.
+    """
+    daemon_threads = True
+
+    def __init__(self, handler_class, listing=None, latency=0.0, error_rate=0.0, airtable_path=AIRTABLE_PATH):
+        super().__init__(("127.0.0.1", 0), handler_class)
+        self.request_counts = Counter()
+        self.lock = threading.Lock()
+        self.listing = listing  # Served at /events/listing
+        self.extra_listings = {}  # Listing path -> listing, for crawls of several sources
+        self.latency = latency  # Seconds added to every response
+        self.error_rate = error_rate  # Share of AJAX requests answered with a 503
+        self.ajax_requests = 0
+        self.airtable_path = airtable_path
+        self.airtable_records = {}
+        self.first_write_at = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def total_requests(self):
+        return sum(self.request_counts.values())
+
+    def count(self, method, path):
+        with self.lock:
+            self.request_counts[f"{method} {path}"] += 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """
+    Base handler with keep-alive and small helpers for the stand-in servers.
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse shows up in the benchmarks
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _begin(self, method):
+        # Counts the request, applies the injected latency and returns the parsed URL
+        url = urlparse(self.path)
+        self.server.count(method, url.path)
+        time.sleep(self.server.latency)
+        return url
+
+    def _send(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, body, headers=None):
+        self._send(status, json.dumps(body).encode(), "application/json", headers)
+
+
+class AirtableMixin:
+    """
+    Implements the list (GET) and batch upsert (PATCH with performUpsert) endpoints of
+    the Airtable table at server.airtable_path.
+    """
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def handle_airtable_get(self, url):
+        if url.path != self.server.airtable_path:
+            return self._send_json(404, {"error": "NOT_FOUND"})
+
+        query = parse_qs(url.query)
+        page_size = min(int(query.get("pageSize", ["100"])[0]), 100)
+        offset = int(query.get("offset", ["0"])[0])
+        wanted = query.get("fields[]")
+        with self.server.lock:
+            records = list(self.server.airtable_records.values())
+        page = records[offset:offset + page_size]
+        body = {"records": [{"id": r["id"], "fields": {k: v for k, v in r["fields"].items() if not wanted or k in wanted}}
+                            for r in page]}
+        if offset + page_size < len(records):
+            body["offset"] = str(offset + page_size)
+        self._send_json(200, body)
+
+    def handle_airtable_patch(self, url):
+        if self.server.first_write_at is None:
+            self.server.first_write_at = time.perf_counter()
+        if url.path != self.server.airtable_path:
+            return self._send_json(404, {"error": "NOT_FOUND"})
+
+        payload = self._read_json()
+        records = payload.get("records", [])
+        merge_fields = payload.get("performUpsert", {}).get("fieldsToMergeOn", [])
+        if len(records) > 10 or not merge_fields:
+            return self._send_json(422, {"error": "INVALID_REQUEST"})
+
+        store = self.server.airtable_records
+        response_records, created = [], []
+        with self.server.lock:
+            for record in records:
+                key = tuple(record["fields"].get(field) for field in merge_fields)
+                existing = store.get(key)
+                if existing is None:
+                    existing = {"id": f"rec{len(store) + 1:014d}", "fields": {}}
+                    store[key] = existing
+                    created.append(existing["id"])
+                existing["fields"].update(record["fields"])
+                response_records.append({"id": existing["id"], "fields": dict(existing["fields"])})
+        self._send_json(200, {"records": response_records, "createdRecords": created,
+                              "updatedRecords": [r["id"] for r in response_records if r["id"] not in created]})
+
+
+class AirtableHandler(AirtableMixin, JSONHandler):
+
+    def do_GET(self):
+        self.handle_airtable_get(self._begin("GET"))
+
+    def do_PATCH(self):
+        self.handle_airtable_patch(self._begin("PATCH"))
+
+
+def start_airtable_stand_in(latency=0.0):
+    """
+    Starts an Airtable stand-in on a free local port and returns the server.
+    Records are kept in server.airtable_records, keyed by the merge field values;
+    server.first_write_at holds the perf_counter time of the first write request.
+    """
+    server = StandInServer(AirtableHandler, latency=latency)
+    return server.start()
+
+
+def synthetic_listing(count, seed_locations=("Singapore", "Fontainebleau", "Abu Dhabi", "Online", "San Francisco"),
+                      first=0):
+    """
+    Returns count synthetic listing events, numbered from first, as dicts with title, href, date and location.
+    """
+    return [{
+        "title": f"Synthetic Event {i}",
+        "href": f"/events/synthetic-event-{i}",
+        "date": f"{i % 28 + 1:02d} Jun '25" if i % 3 else f"{i % 20 + 1:02d} - {i % 8 + 21:02d} Jun '25",
+        "location": seed_locations[i % len(seed_locations)]
+    } for i in range(first, first + count)]
+
+
+def render_cards(events):
+    """
+    Renders listing events as INSEAD event card HTML.
+    """
+    cards = []
+    for event in events:
+        date_parts = "".join(f"<span>{html.escape(part)}</span>" for part in event["date"].split(" - "))
+        cards.append(
+            '<div class="event-card-full">'
+            f'<h3 class="h5"><a class="h5__link list-object__heading-link" href="{html.escape(event["href"])}">'
+            f'{html.escape(event["title"])}</a></h3>'
+            f'<div class="event-card-full__datetime"><div class="event__date-container__label">{date_parts}</div></div>'
+            f'<div class="event-card-full__location"><span class="link">{html.escape(event["location"])}</span></div>'
+            '</div>'
+        )
+    return "".join(cards)
+
+
+class SyntheticListing:
+    """
+    Listing of generated events, split into pages of page_size cards.
+    """
+    view_dom_id = "0123456789abcdef"
+
+    def __init__(self, event_count, page_size=12, first=0):
+        self.events = synthetic_listing(event_count, first=first)
+        self.page_size = page_size
+
+    def main_page(self):
+        return (f'<html><body><div class="js-view-dom-id-{self.view_dom_id}">'
+                f'{render_cards(self.events[:self.page_size])}</div></body></html>')
+
+    def ajax_page(self, page):
+        cards = render_cards(self.events[page * self.page_size:(page + 1) * self.page_size])
+        return json.dumps([{"command": "settings", "data": {}},
+                           {"command": "insert", "method": "replaceWith", "data": cards}])
+
+
+class RecordedListing:
+    """
+    Listing replayed from exchanges captured with INSEAD_RECORD_DIR. AJAX pages that were
+    never recorded come back empty, which ends the crawl like the live pager does.
+    Airtable list responses in the recording are exposed as airtable_records to seed the
+    Airtable stand-in, together with the recorded airtable_path.
+    """
+
+    def __init__(self, record_dir):
+        self.main_html = ""
+        self.pages = {}
+        self.airtable_path = AIRTABLE_PATH
+        self.airtable_records = []
+        for name in sorted(os.listdir(record_dir)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(record_dir, name), encoding="utf-8") as f:
+                exchange = json.load(f)
+            if exchange["status"] != 200:
+                continue
+            url = urlparse(exchange["url"])
+            if url.path.endswith("/events/listing"):
+                self.main_html = exchange["body"]
+            elif url.path.endswith("/views/ajax"):
+                self.pages[int(parse_qs(url.query).get("page", ["0"])[0])] = exchange["body"]
+            elif url.path.startswith("/v0/") and exchange["method"] == "GET":
+                self.airtable_path = url.path
+                self.airtable_records.extend(json.loads(exchange["body"]).get("records", []))
+
+    def main_page(self):
+        return self.main_html
+
+    def ajax_page(self, page):
+        return self.pages.get(page, "[]")
+
+
+class InseadMixin:
+    """
+    Serves server.listing as the events listing page (/events/listing, with ETag
+    revalidation) and its Drupal AJAX pager (/views/ajax), and server.extra_listings
+    at their own paths, told apart in the pager by the view_path parameter.
+    server.error_rate of the AJAX requests get a 503 with Retry-After.
+    """
+
+    def _listing(self, path):
+        if path == "/events/listing":
+            return self.server.listing
+        return self.server.extra_listings.get(path)
+
+    def handle_insead_get(self, url):
+        listing = self._listing(url.path)
+        if listing is not None:
+            body = listing.main_page().encode()
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            return self._send(200, body, "text/html; charset=utf-8", {"ETag": etag})
+
+        if url.path == "/views/ajax":
+            with self.server.lock:
+                self.server.ajax_requests += 1
+                inject_error = self.server.error_rate and self.server.ajax_requests % round(1 / self.server.error_rate) == 0
+            if inject_error:
+                return self._send_json(503, {"error": "unavailable"}, {"Retry-After": "0"})
+            query = parse_qs(url.query)
+            listing = self._listing(query.get("view_path", ["/events/listing"])[0])
+            if listing is None:
+                return self._send_json(404, {"error": "NOT_FOUND"})
+            page = int(query.get("page", ["0"])[0])
+            return self._send(200, listing.ajax_page(page).encode(), "application/json")
+
+        self._send_json(404, {"error": "NOT_FOUND"})
+
+
+class InseadHandler(InseadMixin, JSONHandler):
+
+    def do_GET(self):
+        self.handle_insead_get(self._begin("GET"))
+
+
+class SiteHandler(InseadMixin, AirtableMixin, JSONHandler):
+    """
+    Serves both the INSEAD listing and the Airtable table from one port.
+    """
+
+    def do_GET(self):
+        url = self._begin("GET")
+        if url.path.startswith("/v0/"):
+            return self.handle_airtable_get(url)
+        self.handle_insead_get(url)
+
+    def do_PATCH(self):
+        self.handle_airtable_patch(self._begin("PATCH"))
+
+
+def start_insead_stand_in(event_count=120, page_size=12, latency=0.0, error_rate=0.0):
+    """
+    Starts an INSEAD listing stand-in serving event_count synthetic events.
+    """
+    server = StandInServer(InseadHandler, SyntheticListing(event_count, page_size), latency, error_rate)
+    return server.start()
+
+
+def start_site_stand_in(listing, latency=0.0, error_rate=0.0, merge_field=None):
+    """
+    Starts a combined INSEAD + Airtable stand-in for end-to-end runs. A RecordedListing
+    also seeds the Airtable table with its recorded records, keyed on merge_field.
+    """
+    server = StandInServer(SiteHandler, listing, latency, error_rate,
+                           getattr(listing, "airtable_path", AIRTABLE_PATH))
+    for record in getattr(listing, "airtable_records", []):
+        server.airtable_records[(record["fields"].get(merge_field),)] = record
+    return server.start()
@@ -0,0 +1,38 @@
+"""
+Builds a zipapp of the scraper with its modules precompiled, so runs start without
+compiling any source:
+
+    python build_zipapp.py [output]          # inseadevent.pyz by default
+    python inseadevent.pyz run
+
+The archive holds bytecode for the interpreter that built it, so build it with the Python
+version that runs it. Dependencies are not bundled (selectolax and brotli are compiled
+extensions, which cannot be imported from a zip); install requirements.txt alongside.
+"""
+import os
+import py_compile
+import sys
+import tempfile
+import zipapp
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULES = ('inseadevent', 'eventdates', 'eventdedup', 'eventregions', 'eventsources', 'eventstore', 'runmetrics')
+
+
+def build(output):
+    with tempfile.TemporaryDirectory() as staging:
+        for module in MODULES:
+            # Sourceless .pyc files at the archive root are imported as they are
+            py_compile.compile(os.path.join(REPO_DIR, f"{module}.py"), cfile=os.path.join(staging, f"{module}.pyc"),
+                               doraise=True)
+        zipapp.create_archive(staging, output, interpreter="/usr/bin/env python3", main="inseadevent:cli")
+
+
+def main():
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(REPO_DIR, "inseadevent.pyz")
+    build(output)
+    print(f"Built {output} ({os.path.getsize(output) // 1024} KiB) for Python {sys.version.split()[0]}.")
+
+
+if __name__ == "__main__":
+    main()
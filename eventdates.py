@@ -0,0 +1,96 @@
+"""
+Date parsing for INSEAD event cards.
+
+Card dates come in a handful of shapes ("12 Jun '25", "04 - 25 Jun '25",
+"01 Mar '25 - 30 Nov '25", "10 June 2025, 1:00 pm", ...). The patterns below are
+compiled once, dates are built from a month-name lookup table instead of strptime,
+and results are memoized because the same strings repeat across cards and pages.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+MONTHS = {}
+for _number, _name in enumerate(['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                                 'august', 'september', 'october', 'november', 'december'], 1):
+    MONTHS[_name] = MONTHS[_name[:3]] = _number
+MONTHS['sept'] = 9
+
+_DAY = r'(\d{1,2})'
+_MONTH = r'([A-Za-z]+)\.?'
+_YEAR = r"'?(\d{4}|\d{2})\b"
+_TO = r'(?:\s*-\s*|\s+)' # The card extractor drops standalone dashes, so plain whitespace also separates a range
+
+# Range patterns, tried in order when the string looks like a range.
+# Each maps its groups to (start day, start month, start year, end day, end month, end year) indexes.
+_RANGE_PATTERNS = [
+    # 01 Mar '25 - 30 Nov '25
+    (re.compile(rf'{_DAY}\s+{_MONTH}\s+{_YEAR}{_TO}{_DAY}\s+{_MONTH}\s+{_YEAR}'), (1, 2, 3, 4, 5, 6)),
+    # 28 Jun - 02 Jul '25
+    (re.compile(rf'{_DAY}\s+{_MONTH}{_TO}{_DAY}\s+{_MONTH}\s+{_YEAR}'), (1, 2, 5, 3, 4, 5)),
+    # 04 - 25 Jun '25
+    (re.compile(rf'{_DAY}{_TO}{_DAY}\s+{_MONTH}\s+{_YEAR}'), (1, 3, 4, 2, 3, 4)),
+]
+# 10 June 2025, 1:00 pm / 10 June 2025 / 12 Jun '25 / 12 Jun 25
+_SINGLE_PATTERN = re.compile(rf'{_DAY}\s+{_MONTH},?\s+{_YEAR}')
+# Two dates without a dash between them, as in "04 25 Jun '25" or "01 Mar '25 30 Nov '25"
+_DASHLESS_RANGE = re.compile(r"\b\d{1,2}\s+(?:[A-Za-z]+\.?\s+(?:'?\d{2,4}\s+)?)?\d{1,2}\s")
+
+
+def _build_date(day, month_name, year):
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+    year = int(year)
+    if year < 100:
+        year += 2000 # Assume '25 means 2025
+    day = int(day)
+    if not 1 <= day <= 31:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError: # e.g. 31 Jun
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date_range(date_str):
+    """
+    Parses an event card date string into a (start, end) pair of ISO 8601 (YYYY-MM-DD) dates.
+    The end date is None for single-day events; unparseable strings return (None, None).
+    """
+    if not date_str:
+        return None, None
+
+    # Clean up the date string by removing extra spaces
+    date_str = ' '.join(date_str.split())
+    # Every known format starts with the day number, so anchored matching is the fast path;
+    # anything else (e.g. a leading weekday) falls back to searching the whole string.
+    if date_str[:1].isdigit():
+        find = 'match'
+    elif any(char.isdigit() for char in date_str):
+        find = 'search'
+    else:
+        print(f"Warning: Could not parse date string: '{date_str}'")
+        return None, None
+
+    if '-' in date_str or getattr(_DASHLESS_RANGE, find)(date_str):
+        for pattern, (sd, sm, sy, ed, em, ey) in _RANGE_PATTERNS:
+            match = getattr(pattern, find)(date_str)
+            if match:
+                groups = match.groups()
+                start = _build_date(groups[sd - 1], groups[sm - 1], groups[sy - 1])
+                end = _build_date(groups[ed - 1], groups[em - 1], groups[ey - 1])
+                if start and end:
+                    if start > end and start.month > end.month and sy == ey:
+                        start = _build_date(start.day, groups[sm - 1], start.year - 1) or start # 28 Dec - 02 Jan '26
+                    return start.isoformat(), end.isoformat()
+
+    match = getattr(_SINGLE_PATTERN, find)(date_str)
+    if match:
+        single = _build_date(*match.groups())
+        if single:
+            return single.isoformat(), None
+
+    print(f"Warning: Could not parse date string: '{date_str}'")
+    return None, None
@@ -0,0 +1,211 @@
+"""
+Cross-source deduplication of crawled events.
+
+Every event gets one canonical key when it is built: its normalised title plus its
+canonical URL (lower-cased scheme and host, no default port, tracking parameters, fragment
+or trailing slash). The event keeps its original link; the key is its custom_unique_id, so events are deduplicated in
+memory on the same key Airtable merges on. DedupIndex keeps one compact EventRecord per
+key and folds later sightings into it following MERGE_POLICY, in constant time per event.
+"""
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]')
+_REPEATED_SLASHES = re.compile(r'/{2,}')
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Query parameters that only record how a visitor arrived and never change the page
+TRACKING_PARAMETERS = frozenset({'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', '_gl'})
+TRACKING_PREFIXES = ('utm_',)
+
+
+def normalize_title(title):
+    """
+    Lower-cases a title and drops everything but letters and digits.
+    """
+    return _NON_ALPHANUMERIC.sub('', title.lower())
+
+
+def _is_tracking_parameter(parameter):
+    name = parameter.split('=', 1)[0].lower()
+    return name in TRACKING_PARAMETERS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url):
+    """
+    Returns the canonical form of an event URL, so that links differing only in tracking
+    parameters, fragment, trailing slash, scheme/host case or default port compare equal.
+    Other query parameters are kept as they are, in their original order.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    try:
+        if parts.port is not None and parts.port == _DEFAULT_PORTS.get(scheme):
+            netloc = netloc.rsplit(':', 1)[0]
+    except ValueError: # Not a numeric port, leave the host as it is
+        pass
+    path = _REPEATED_SLASHES.sub('/', parts.path).rstrip('/')
+    query = '&'.join(parameter for parameter in parts.query.split('&') if parameter and not _is_tracking_parameter(parameter))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def canonical_key(title, url):
+    """
+    Returns the dedup key of an event, which is also its custom_unique_id in Airtable.
+    """
+    return f"{normalize_title(title)}-{canonical_url(url)}"
+
+
+# Event dict keys stored as EventRecord attributes, in the order events are rebuilt
+EVENT_ATTRIBUTES = {
+    'event': 'title',
+    'Month & Day': 'start_date',
+    'End Date': 'end_date',
+    'location': 'location',
+    'eventurl': 'url',
+    'Added At': 'added_at',
+    'AsiaRelated': 'asia_related',
+    'Region': 'regions',
+    'sources': 'sources'
+}
+
+
+@dataclass(slots=True)
+class EventRecord:
+    """
+    Compact in-memory form of a unique event. Event fields without an attribute of their
+    own (such as fields stamped by a source) are kept in extra.
+    """
+    key: str
+    title: str = ''
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    location: str = ''
+    url: str = ''
+    added_at: str = ''
+    asia_related: bool = False
+    regions: list = field(default_factory=list)
+    sources: list = field(default_factory=list)
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_event(cls, event):
+        record = cls(event['custom_unique_id'],
+                     **{attribute: event[key] for key, attribute in EVENT_ATTRIBUTES.items() if key in event})
+        record.sources = list(record.sources)
+        extra = {key: value for key, value in event.items() if key not in EVENT_ATTRIBUTES and key != 'custom_unique_id'}
+        record.extra = extra or None
+        return record
+
+    def to_event(self):
+        """
+        Returns the record as a new event dict.
+        """
+        event = {key: getattr(self, attribute) for key, attribute in EVENT_ATTRIBUTES.items()}
+        event['Region'] = list(self.regions)
+        event['sources'] = list(self.sources)
+        if self.extra:
+            event.update(self.extra)
+        event['custom_unique_id'] = self.key
+        return event
+
+
+_EMPTY = (None, '', [])
+
+
+def fill_empty(current, new):
+    """Takes the new value only where the current one is missing."""
+    return new if current in _EMPTY and new not in _EMPTY else current
+
+
+def keep_first(current, new):
+    """Keeps the value from the first sighting."""
+    return current
+
+
+def any_true(current, new):
+    """Set once any sighting says so (e.g. one source tags the event as Asia-related)."""
+    return bool(current or new)
+
+
+def union(current, new):
+    """Appends the values not seen yet, keeping their first-seen order."""
+    added = [value for value in new or () if value not in current]
+    return current + added if added else current
+
+
+# How each field of a later sighting is folded into the stored event.
+# Fields not listed here (including extra fields) use DEFAULT_MERGE.
+MERGE_POLICY = {
+    'event': keep_first,  # Titles can differ in case and punctuation under the same key
+    'eventurl': keep_first,
+    'Added At': keep_first,
+    'Month & Day': fill_empty,
+    'End Date': fill_empty,
+    'location': fill_empty,
+    'Region': fill_empty,  # Derived from the location, so it follows the same policy
+    'AsiaRelated': any_true,
+    'sources': union
+}
+DEFAULT_MERGE = fill_empty
+
+
+class DedupIndex:
+    """
+    Thread-safe index of unique events keyed on their canonical key (custom_unique_id),
+    shared by every source crawled in a run.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def add(self, event):
+        """
+        Adds a sighting of an event dict that has a custom_unique_id.
+        Returns (event, is_new): event is a new dict of the stored event if the sighting
+        added it or changed it, otherwise None.
+        """
+        with self._lock:
+            record = self._records.get(event['custom_unique_id'])
+            if record is None:
+                record = self._records[event['custom_unique_id']] = EventRecord.from_event(event)
+                return record.to_event(), True
+            return (record.to_event() if self._merge(record, event) else None), False
+
+    @staticmethod
+    def _merge(record, event):
+        changed = False
+        for key, value in event.items():
+            attribute = EVENT_ATTRIBUTES.get(key)
+            if attribute is not None:
+                current = getattr(record, attribute)
+                merged = MERGE_POLICY.get(key, DEFAULT_MERGE)(current, value)
+                if merged is not current and merged != current:
+                    setattr(record, attribute, merged)
+                    changed = True
+            elif key != 'custom_unique_id':
+                extra = record.extra or {}
+                current = extra.get(key)
+                merged = MERGE_POLICY.get(key, DEFAULT_MERGE)(current, value)
+                if merged != current:
+                    extra[key] = merged
+                    record.extra = extra
+                    changed = True
+        return changed
+
+    def events(self):
+        """
+        Returns all unique events as new dicts.
+        """
+        with self._lock:
+            return [record.to_event() for record in self._records.values()]
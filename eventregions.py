@@ -0,0 +1,147 @@
+"""
+Region classification for event card locations.
+
+PLACES maps regions to the city, country and area names that identify them, and to the
+demonyms locations use instead ("Asian", "Malaysian"). The table is compiled on first use
+into a single case-insensitive regex with word boundaries, shaped as a trie of the names
+so that matching walks shared prefixes once instead of trying every name in turn. Longer
+names win ("Mexico City" over "Mexico"), word boundaries keep "Indiana" from matching
+"India", and the words of a name may also be joined by hyphens or nothing ("Hong-Kong",
+"HongKong"). Names in AMBIGUOUS_PLACES only count when no other place is named, so
+"Perth, Scotland" is in Europe. Results are memoized because locations repeat across cards.
+"""
+import re
+from functools import lru_cache
+
+# Region tags, in the order they are reported
+REGIONS = ('Asia', 'Middle East', 'Europe', 'Africa', 'North America', 'Latin America', 'Oceania', 'Online')
+ASIA_REGIONS = frozenset({'Asia'})  # Regions that set AsiaRelated
+
+PLACES = {
+    'Asia': [
+        'asia', 'apac', 'asia pacific', 'south east asia', 'southeast asia',
+        'singapore', 'china', 'beijing', 'shanghai', 'shenzhen', 'guangzhou', 'hangzhou', 'chengdu',
+        'hong kong', 'macau', 'macao', 'taiwan', 'taipei', 'japan', 'tokyo', 'osaka', 'kyoto', 'yokohama',
+        'korea', 'south korea', 'seoul', 'busan', 'india', 'mumbai', 'bombay', 'delhi', 'new delhi',
+        'bangalore', 'bengaluru', 'chennai', 'hyderabad', 'kolkata', 'pune', 'ahmedabad', 'gurgaon', 'gurugram',
+        'indonesia', 'jakarta', 'bali', 'surabaya', 'malaysia', 'kuala lumpur', 'penang', 'thailand', 'bangkok',
+        'vietnam', 'viet nam', 'hanoi', 'ho chi minh city', 'saigon', 'philippines', 'manila', 'cebu',
+        'cambodia', 'phnom penh', 'myanmar', 'yangon', 'laos', 'vientiane', 'brunei', 'sri lanka', 'colombo',
+        'pakistan', 'karachi', 'lahore', 'islamabad', 'bangladesh', 'dhaka', 'nepal', 'kathmandu',
+        'mongolia', 'ulaanbaatar', 'kazakhstan', 'almaty', 'astana', 'uzbekistan', 'tashkent',
+        'asian', 'chinese', 'singaporean', 'japanese', 'korean', 'indian', 'indonesian', 'malaysian', 'thai',
+        'vietnamese', 'filipino', 'taiwanese', 'cambodian', 'sri lankan', 'pakistani', 'bangladeshi', 'nepali',
+        'nepalese', 'mongolian', 'kazakh',
+    ],
+    'Middle East': [
+        'middle east', 'mena', 'gcc', 'abu dhabi', 'dubai', 'sharjah', 'uae', 'united arab emirates',
+        'saudi arabia', 'riyadh', 'jeddah', 'qatar', 'doha', 'kuwait', 'bahrain', 'manama', 'oman', 'muscat',
+        'jordan', 'amman', 'lebanon', 'beirut', 'israel', 'tel aviv', 'jerusalem', 'iran', 'tehran', 'iraq',
+        'baghdad', 'middle eastern', 'emirati',
+    ],
+    'Europe': [
+        'europe', 'emea', 'fontainebleau', 'paris', 'france', 'lyon', 'marseille', 'london', 'united kingdom',
+        'uk', 'england', 'scotland', 'edinburgh', 'manchester', 'ireland', 'dublin', 'germany', 'berlin',
+        'munich', 'frankfurt', 'hamburg', 'dusseldorf', 'düsseldorf', 'cologne', 'switzerland', 'zurich',
+        'zürich', 'geneva', 'lausanne', 'basel', 'netherlands', 'amsterdam', 'rotterdam', 'the hague',
+        'belgium', 'brussels', 'antwerp', 'luxembourg', 'spain', 'madrid', 'barcelona', 'portugal', 'lisbon',
+        'porto', 'italy', 'milan', 'rome', 'turin', 'austria', 'vienna', 'denmark', 'copenhagen', 'sweden',
+        'stockholm', 'norway', 'oslo', 'finland', 'helsinki', 'iceland', 'reykjavik', 'poland', 'warsaw',
+        'krakow', 'czech republic', 'czechia', 'prague', 'hungary', 'budapest', 'greece', 'athens', 'romania',
+        'bucharest', 'bulgaria', 'sofia', 'croatia', 'zagreb', 'serbia', 'belgrade', 'turkey', 'türkiye',
+        'istanbul', 'russia', 'moscow', 'ukraine', 'kyiv', 'kiev', 'estonia', 'tallinn', 'latvia', 'riga',
+        'lithuania', 'vilnius', 'monaco', 'cyprus', 'malta', 'european', 'nordic', 'scandinavian',
+    ],
+    'Africa': [
+        'africa', 'south africa', 'johannesburg', 'cape town', 'durban', 'nigeria', 'lagos', 'abuja', 'kenya',
+        'nairobi', 'morocco', 'casablanca', 'rabat', 'marrakech', 'ghana', 'accra', 'egypt', 'cairo',
+        'ethiopia', 'addis ababa', 'tunisia', 'tunis', 'algeria', 'algiers', 'senegal', 'dakar', 'rwanda',
+        'kigali', 'uganda', 'kampala', 'tanzania', 'dar es salaam', "cote d'ivoire", "côte d'ivoire",
+        'ivory coast', 'abidjan', 'mauritius', 'african',
+    ],
+    'North America': [
+        'north america', 'usa', 'united states', 'new york', 'nyc', 'boston', 'chicago', 'san francisco',
+        'silicon valley', 'palo alto', 'los angeles', 'san diego', 'seattle', 'washington', 'miami', 'houston',
+        'dallas', 'austin', 'atlanta', 'denver', 'philadelphia', 'canada', 'toronto', 'montreal', 'montréal',
+        'vancouver', 'calgary', 'ottawa', 'north american',
+    ],
+    'Latin America': [
+        'latin america', 'latam', 'mexico', 'mexico city', 'monterrey', 'brazil', 'brasil', 'sao paulo',
+        'são paulo', 'rio de janeiro', 'argentina', 'buenos aires', 'chile', 'santiago', 'colombia', 'bogota',
+        'bogotá', 'medellin', 'medellín', 'peru', 'lima', 'uruguay', 'montevideo', 'costa rica', 'panama',
+        'ecuador', 'quito', 'latin american',
+    ],
+    'Oceania': [
+        'oceania', 'australia', 'sydney', 'melbourne', 'brisbane', 'perth', 'adelaide', 'canberra',
+        'new zealand', 'auckland', 'wellington', 'australian',
+    ],
+    'Online': ['online', 'virtual', 'webinar', 'livestream', 'live stream', 'zoom', 'hybrid'],
+}
+
+# Single-word names that are also other places, venues or people's names ("Perth, Scotland",
+# "Jordan Hall, Boston"): they only count when the location names no other place
+AMBIGUOUS_PLACES = frozenset({'perth', 'jordan', 'santiago', 'wellington', 'sofia', 'austin'})
+
+PLACE_REGIONS = {place: region for region, places in PLACES.items() for place in places}
+_REGION_ORDER = {region: i for i, region in enumerate(REGIONS)}
+
+
+def _compact(name):
+    # Lookup key of a name or match: lower case, without the spaces or hyphens between its words
+    return ''.join(name.split()).replace('-', '').lower()
+
+
+@lru_cache(maxsize=None)
+def _compact_regions():
+    return {_compact(place): region for place, region in PLACE_REGIONS.items()}
+
+
+def _trie_pattern(names):
+    # Regex source matching any of names, factored by common prefix; a space between words
+    # matches any whitespace, hyphens or nothing
+    trie = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[''] = {} # End of a name
+
+    def build(node):
+        branches = [(r'[\s-]*' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A name ending here makes the rest optional; greedy matching still prefers the longer name
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+@lru_cache(maxsize=None)
+def _place_pattern():
+    # Compiled on first use rather than at import, as it is the slowest part of starting up
+    return re.compile(r'\b(?:' + _trie_pattern(PLACE_REGIONS) + r')\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def classify_location(location):
+    """
+    Returns the regions a location string mentions as a tuple in REGIONS order,
+    e.g. ('Asia', 'Europe') for "Singapore & Fontainebleau"; () if none is recognised.
+    """
+    if not location:
+        return ()
+    places = {_compact(match) for match in _place_pattern().findall(location)}
+    specific_places = places - AMBIGUOUS_PLACES
+    compact_regions = _compact_regions()
+    regions = {compact_regions.get(place) for place in (specific_places or places)}
+    regions.discard(None) # Case-folding quirks of non-ASCII letters
+    return tuple(sorted(regions, key=_REGION_ORDER.get))
+
+
+def is_asia_related(location):
+    """
+    Checks if a location string names a place in Asia.
+    """
+    return not ASIA_REGIONS.isdisjoint(classify_location(location))
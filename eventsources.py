@@ -0,0 +1,110 @@
+"""
+Definitions of the event listings the scraper crawls and the Airtable tables it syncs to.
+
+An EventSource describes one Drupal listing view: the page it lives on, the view the
+/views/ajax pager walks, CSS selectors for its event cards, fields stamped on every
+event it yields and the Airtable tables its events are written to. An AirtableTable
+maps event fields to the field IDs of one table.
+
+Sources and extra tables can be loaded from a JSON file (see load_config):
+
+    {
+        "sources": [
+            {"name": "events", "listing_path": "/events/listing", "view_name": "events_listing"},
+            {"name": "alumni", "listing_path": "/alumni/events", "view_name": "alumni_events",
+             "selectors": {"location": ".event-card__venue"}, "fields": {"Source": "Alumni"},
+             "tables": ["events", "alumni"]}
+        ],
+        "tables": {
+            "alumni": {"base_id": "appXXXXXXXXXXXXXX", "table_id": "tblXXXXXXXXXXXXXX",
+                       "fields": {"event": "fldXXXXXXXXXXXXXX", "Event Unique ID": "fldXXXXXXXXXXXXXX"}}
+        }
+    }
+"""
+import json
+
+AIRTABLE_API_BASE = "https://api.airtable.com/v0"
+# Fields that are not part of an event's content fingerprint: 'Added At' is kept from the
+# first time an event was seen, the others are derived from the event itself.
+UNFINGERPRINTED_FIELDS = ('Added At', 'Event Unique ID', 'Fingerprint')
+
+
+class EventSource:
+    """
+    One listing view to crawl. selectors override individual keys of the default card
+    selectors, fields are added to every event from this source, and tables names the
+    Airtable tables (keys of the tables dict) its events are synced to.
+    """
+
+    def __init__(self, name, listing_path, view_name, view_display_id=None, selectors=None, fields=None,
+                 tables=('events',)):
+        self.name = name
+        self.listing_path = listing_path
+        self.view_name = view_name
+        self.view_display_id = view_display_id or view_name
+        self.selectors = selectors or {}
+        self.fields = fields or {}
+        self.tables = tuple(tables)
+
+    def __repr__(self):
+        return f"EventSource({self.name!r}, {self.listing_path!r}, {self.view_name!r})"
+
+    def ajax_params(self, view_dom_id, page):
+        """
+        Returns the query parameters of the Drupal AJAX pager request for a page of this view.
+        """
+        return {
+            '_wrapper_format': 'drupal_ajax',
+            'view_name': self.view_name,
+            'view_display_id': self.view_display_id,
+            'view_args': '',
+            'view_path': self.listing_path,
+            'view_base_path': self.listing_path.lstrip('/'),
+            'view_dom_id': view_dom_id,
+            'pager_element': 0,
+            'page': page, # This 'page' parameter controls the AJAX pagination
+            '_drupal_ajax': 1,
+            'ajax_page_state[theme]': 'insead_core',
+            'ajax_page_state[theme_token]': '',
+            'ajax_page_state[libraries]': '' # This might need to be dynamically extracted or kept empty if not critical
+        }
+
+
+class AirtableTable:
+    """
+    One Airtable table to sync: its API URL and the field IDs keyed by event field name.
+    'Event Unique ID' is required; it holds the event's custom_unique_id and is the upsert key.
+    fingerprint_fields defaults to every mapped field except UNFINGERPRINTED_FIELDS.
+    """
+
+    def __init__(self, name, api_url, fields, fingerprint_fields=None):
+        self.name = name
+        self.api_url = api_url
+        self.fields = fields
+        self.fingerprint_fields = list(fingerprint_fields if fingerprint_fields is not None else
+                                       [key for key in fields if key not in UNFINGERPRINTED_FIELDS])
+
+    def __repr__(self):
+        return f"AirtableTable({self.name!r}, {self.api_url!r})"
+
+
+def load_config(path):
+    """
+    Reads source and table definitions from a JSON file.
+    Returns (sources, tables): a list of EventSource (empty if the file defines none)
+    and a dict of AirtableTable by name.
+    Raises OSError, ValueError, KeyError or TypeError for unreadable or invalid files.
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    sources = [EventSource(**definition) for definition in config.get('sources', [])]
+    tables = {}
+    for name, definition in config.get('tables', {}).items():
+        if 'Event Unique ID' not in definition['fields']:
+            raise ValueError(f"Airtable table '{name}' in {path} has no 'Event Unique ID' field")
+        api_url = definition.get('api_url') or f"{AIRTABLE_API_BASE}/{definition['base_id']}/{definition['table_id']}"
+        tables[name] = AirtableTable(name, api_url, definition['fields'], definition.get('fingerprint_fields'))
+    names = [source.name for source in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate source names in {path}: {names}")
+    return sources, tables
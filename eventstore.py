@@ -0,0 +1,137 @@
+"""
+Optional local SQLite store of crawled events.
+
+Keyed on the custom unique ID, it keeps each parsed event with its content
+fingerprint, Airtable record ID, first/last-seen timestamps and sync status.
+It serves both as a journal (failed uploads are retried on the next run) and as a
+lookup cache of what Airtable already holds, so incremental runs only touch the delta.
+The database is a single file that can be restored from the GitHub Actions cache.
+"""
+import json
+import pathlib
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    custom_unique_id TEXT PRIMARY KEY,
+    event_json TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    airtable_record_id TEXT,
+    synced_fingerprint TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    sync_status TEXT NOT NULL, -- 'pending', 'synced' or 'failed'
+    sync_error TEXT
+);
+CREATE INDEX IF NOT EXISTS events_sync_status ON events (sync_status);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class EventStore:
+    """
+    SQLite-backed event store. Open it with EventStore(path) and close() it at the end
+    of the run so the write-ahead log is folded back into the single database file.
+    With read_only=True an existing database is opened without creating or changing any file
+    (for dry runs); writes then raise sqlite3.OperationalError.
+    """
+
+    def __init__(self, path, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            # immutable also keeps SQLite from creating the -wal and -shm files; close() folds
+            # the log into the database file, so it holds everything earlier runs wrote
+            self.conn = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + '?mode=ro&immutable=1', uri=True)
+            self.conn.row_factory = sqlite3.Row
+            return
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        if not self.read_only:
+            self.conn.commit()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def get(self, custom_unique_id):
+        """
+        Returns the stored row for an event as a dict, or None.
+        """
+        row = self.conn.execute("SELECT * FROM events WHERE custom_unique_id = ?", (custom_unique_id,)).fetchone()
+        return dict(row) if row else None
+
+    def record_seen(self, event_data, fingerprint, seen_at):
+        """
+        Stores a crawled event and returns the time it was first seen.
+        The event is marked 'pending' unless Airtable already holds this exact content.
+        """
+        custom_unique_id = event_data['custom_unique_id']
+        self.conn.execute(
+            """
+            INSERT INTO events (custom_unique_id, event_json, fingerprint, first_seen, last_seen, sync_status)
+            VALUES (?, ?, ?, ?, ?, 'pending')
+            ON CONFLICT (custom_unique_id) DO UPDATE SET
+                event_json = excluded.event_json,
+                fingerprint = excluded.fingerprint,
+                last_seen = excluded.last_seen,
+                sync_status = CASE WHEN synced_fingerprint = excluded.fingerprint THEN 'synced' ELSE 'pending' END
+            """,
+            (custom_unique_id, json.dumps(event_data), fingerprint, seen_at, seen_at))
+        self.conn.commit()
+        return self.conn.execute("SELECT first_seen FROM events WHERE custom_unique_id = ?",
+                                 (custom_unique_id,)).fetchone()[0]
+
+    def mark_result(self, result):
+        """
+        Records the outcome of an Airtable sync result dict for its event.
+        """
+        if result['status'] == 'failed':
+            self.conn.execute("UPDATE events SET sync_status = 'failed', sync_error = ? WHERE custom_unique_id = ?",
+                              (result['error'], result['custom_unique_id']))
+        else:
+            self.conn.execute(
+                """
+                UPDATE events SET sync_status = 'synced', sync_error = NULL,
+                    airtable_record_id = ?, synced_fingerprint = fingerprint
+                WHERE custom_unique_id = ?
+                """,
+                (result['record_id'], result['custom_unique_id']))
+        self.conn.commit()
+
+    def unsynced_events(self):
+        """
+        Returns the events whose last upload failed or never happened, for retrying.
+        """
+        rows = self.conn.execute("SELECT event_json FROM events WHERE sync_status != 'synced' ORDER BY first_seen")
+        return [json.loads(row[0]) for row in rows]
+
+    def airtable_index(self):
+        """
+        Returns an index of synced events in the shape of fetch_airtable_index, with the
+        synced fingerprint under 'fingerprint', so unchanged events can be skipped without
+        querying Airtable.
+        """
+        rows = self.conn.execute(
+            "SELECT custom_unique_id, airtable_record_id, synced_fingerprint FROM events "
+            "WHERE airtable_record_id IS NOT NULL AND synced_fingerprint IS NOT NULL")
+        return {row[0]: {'id': row[1], 'fields': {}, 'fingerprint': row[2]} for row in rows}
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                          "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value))
+        self.conn.commit()
@@ -1,19 +1,83 @@
-import requests
-from bs4 import BeautifulSoup
 import re
-from datetime import datetime
-import pytz
+from datetime import datetime, timedelta, timezone
 import os
+import sys
 import time # Import time for rate limiting
+import hashlib
+import json
+import math
+import threading
+import itertools
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from eventdates import parse_date_range
+from eventdedup import DedupIndex, canonical_key
+from eventregions import classify_location, is_asia_related
+from eventsources import AirtableTable, EventSource, load_config
+from eventstore import EventStore
+from runmetrics import COUNT_BUCKETS, METRICS
 
-MAIN_URL = "https://www.insead.edu/events/listing"
+
+def _positive_number(value):
+    # Rates are divided by, so they must be finite and greater than 0 (nan would turn off the limit)
+    try:
+        number = float(value)
+    except ValueError:
+        number = math.nan
+    if not (math.isfinite(number) and number > 0):
+        raise ValueError(f"must be a finite number greater than 0, got {value!r}")
+    return number
+
+
+def _positive_env_number(name, default):
+    # Reads a rate setting; raises ValueError naming the variable if it is not a positive number
+    try:
+        return _positive_number(os.environ.get(name, default))
+    except ValueError as e:
+        raise ValueError(f"{name} {e}") from None
+
+
+SITE_URL = "https://www.insead.edu"
+# The base URL can be overridden to crawl a local stand-in server (see benchmarks/).
+INSEAD_BASE_URL = os.environ.get("INSEAD_BASE_URL", SITE_URL)
+MAIN_URL = f"{INSEAD_BASE_URL}/events/listing"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     # Add X-Requested-With header, crucial for AJAX requests
     "X-Requested-With": "XMLHttpRequest" 
 }
 
-AJAX_URL = "https://www.insead.edu/views/ajax"
+AJAX_URL = f"{INSEAD_BASE_URL}/views/ajax"
+# The listing crawled by default; its pages are MAIN_URL and AJAX_URL.
+DEFAULT_SOURCE = EventSource('events', '/events/listing', 'events_listing')
+# JSON file of extra listing views and Airtable tables to crawl and sync in the same run
+# (see eventsources.py for the format; '' crawls DEFAULT_SOURCE into the table below only)
+SOURCES_PATH = os.environ.get("INSEAD_SOURCES", "")
+
+# AJAX page fetching settings
+FETCH_CONCURRENCY = int(os.environ.get("INSEAD_FETCH_CONCURRENCY", "4"))  # Parallel page requests
+FETCH_PREFETCH_PAGES = int(os.environ.get("INSEAD_PREFETCH_PAGES", str(FETCH_CONCURRENCY)))  # Pages requested ahead of the one being processed
+FETCH_RATE = _positive_env_number("INSEAD_FETCH_RATE", "4")  # Sustained requests per second
+FETCH_BURST = int(os.environ.get("INSEAD_FETCH_BURST", "2"))  # Requests allowed back to back before the rate applies
+FETCH_MAX_RETRIES = int(os.environ.get("INSEAD_FETCH_RETRIES", "3"))  # Retries on 429/5xx and connection errors
+FETCH_BACKOFF = float(os.environ.get("INSEAD_FETCH_BACKOFF", "1"))  # Base delay in seconds, doubled on every retry
+FETCH_TIMEOUT = 30  # Seconds before an INSEAD request is abandoned
+FETCH_MAX_SKIPPED_PAGES = 3  # Consecutive AJAX pages that still fail after retries before pagination gives up
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# HTML parser used for event cards: 'selectolax', 'lxml', 'bs4', or 'auto' for the fastest installed one
+PARSER_BACKEND = os.environ.get("INSEAD_PARSER_BACKEND", "auto")
+# CSS selectors locating the fields of an event card
+CARD_SELECTORS = {
+    'card': '.event-card-full',
+    'title': '.h5__link.list-object__heading-link',
+    'date_label': '.event__date-container__label',  # Preferred, more robust date container
+    'date_fallback': '.event-card-full__datetime .link',
+    'location': '.event-card-full__location .link'
+}
+# ETag / Last-Modified validators and bodies kept between runs for conditional requests ('' disables)
+HTTP_CACHE_PATH = os.environ.get("INSEAD_HTTP_CACHE", ".inseadevent_http_cache.json")
 
 # Airtable configuration
 # It's highly recommended to use environment variables for sensitive data like API keys.
@@ -21,7 +85,36 @@ AJAX_URL = "https://www.insead.edu/views/ajax"
 AIRTABLE_BASE_ID = "appoz4aD0Hjolycwd"
 AIRTABLE_TABLE_ID = "tblSvkrwpJlB4A195"
 AIRTABLE_API_KEY = os.environ.get("AIRTABLE_API_KEY")
-AIRTABLE_API_URL = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_ID}"
+# The API URL can be overridden to point the sync at a local stand-in server (see benchmarks/).
+AIRTABLE_API_URL = os.environ.get("AIRTABLE_API_URL", f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_ID}")
+AIRTABLE_BATCH_SIZE = 10  # Airtable accepts at most 10 records per create/update request
+AIRTABLE_MAX_RETRIES = 3  # Retries for a batch that hits Airtable's rate limit (HTTP 429)
+AIRTABLE_RATE_LIMIT_WAIT = 30  # Seconds Airtable asks clients to back off after a 429
+AIRTABLE_TIMEOUT = 30  # Seconds before an Airtable request is abandoned; its batch then fails
+AIRTABLE_PAGE_SIZE = 100  # Largest page size the Airtable list endpoint allows
+AIRTABLE_RATE = _positive_env_number("AIRTABLE_RATE", "5")  # Requests per second; Airtable allows 5 per base
+AIRTABLE_CONCURRENCY = int(os.environ.get("AIRTABLE_CONCURRENCY", "3"))  # Batches the asyncio pipeline uploads at once
+# Preload an index of existing records once per run and skip records whose fields have not changed.
+AIRTABLE_USE_INDEX = os.environ.get("AIRTABLE_USE_INDEX", "1") != "0"
+# Optional SQLite event store kept between runs as crawl cache and sync journal ('' disables)
+EVENT_STORE_PATH = os.environ.get("INSEAD_EVENT_STORE", "")
+# Incremental crawl (needs the event store): stop after this many consecutive pages that hold
+# only known, unchanged events (0 disables), with a full crawl at least every FULL_CRAWL_EVERY_DAYS
+INCREMENTAL_STOP_PAGES = int(os.environ.get("INSEAD_INCREMENTAL_STOP_PAGES", "2"))
+FULL_CRAWL_EVERY_DAYS = float(os.environ.get("INSEAD_FULL_CRAWL_DAYS", "7"))
+FORCE_FULL_CRAWL = os.environ.get("INSEAD_FULL_CRAWL", "0") == "1"
+# Run instrumentation outputs ('' disables each)
+RUN_REPORT_PATH = os.environ.get("INSEAD_RUN_REPORT", "inseadevent_run_report.json")  # JSON run report
+PROMETHEUS_TEXTFILE = os.environ.get("INSEAD_PROMETHEUS_TEXTFILE", "")  # Prometheus textfile collector output
+PROFILE_PATH = os.environ.get("INSEAD_PROFILE", "")  # cProfile stats of the event loop and its worker threads
+# Save every HTTP exchange to this directory for offline replay by benchmarks/bench_e2e.py ('' disables)
+RECORD_DIR = os.environ.get("INSEAD_RECORD_DIR", "")
+
+# Exit codes of the command line interface
+EXIT_OK = 0
+EXIT_ERROR = 1  # Bad configuration or input, or the run failed part way
+EXIT_PARTIAL = 2  # The run completed, but some listing pages could not be fetched or some records not synced
+
 AIRTABLE_FIELDS = {
     'event': 'fldtf8ZLoMws7T2Kb',  # Text
     'Month & Day': 'fldbPvdBcLOYveRCb',  # Date
@@ -29,19 +122,273 @@ AIRTABLE_FIELDS = {
     'eventurl': 'fldGhcjpsG70VKrPd',  # URL
     'Added At': 'fldZ8o1YMKacrc2aG',  # Text
     'AsiaRelated': 'fldcMTZJFG4C6dJDw', # Checkbox
-    'Event Unique ID': 'fldT2yKdU4FYHBAZp' # IMPORTANT: Replace fldXXXXXXX with the actual field ID for your new "Event Unique ID" field in Airtable.
+    'Event Unique ID': 'fldT2yKdU4FYHBAZp', # IMPORTANT: Replace fldXXXXXXX with the actual field ID for your new "Event Unique ID" field in Airtable.
+    # Optional: add 'End Date': 'fldXXXXXXX' (Date) to store the last day of multi-day events.
+    # Optional: add 'Region': 'fldXXXXXXX' (Multiple select) to tag events with the regions of their location
+    # (options as in eventregions.REGIONS).
+    # Optional: add 'Fingerprint': 'fldXXXXXXX' (Text) to store content fingerprints in Airtable.
+    # The index then only needs to download the fingerprint instead of every fingerprinted field.
 }
+# Stable event fields covered by the content fingerprint. 'Added At' is left out on purpose:
+# it is kept from the first time an event was seen.
+FINGERPRINT_FIELDS = ['event', 'Month & Day', 'location', 'eventurl', 'AsiaRelated'] + \
+    [key for key in ('End Date', 'Region') if key in AIRTABLE_FIELDS]
+DEFAULT_TABLE_NAME = 'events'  # Name sources use for the table above; the event store journals its syncs
+EVENT_KEYS = {'Event Unique ID': 'custom_unique_id'}  # Airtable field names that differ from the event keys
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that limits how many requests are started per second.
+    The rate adapts: it is halved when the server pushes back (429/5xx) and
+    recovers gradually towards the configured rate as requests succeed.
+    """
+
+    def __init__(self, rate, capacity):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a request may be started.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._blocked_until - now
+            time.sleep(wait)
+
+    def slow_down(self, pause):
+        """
+        Halves the rate and holds back all requests for pause seconds.
+        """
+        with self._lock:
+            self.rate = max(self.rate / 2, self.max_rate / 16)
+            self._tokens = 0.0
+            self._updated = self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+    def speed_up(self):
+        """
+        Moves the rate back towards the configured maximum after a successful request.
+        """
+        with self._lock:
+            self.rate = min(self.rate * 1.25, self.max_rate)
+
+
+def _retry_after_seconds(response):
+    """
+    Returns the delay requested by a Retry-After header (seconds or HTTP date), or None.
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
 
+def _import_requests():
+    # requests (with urllib3) is imported on first use, so commands and imports that never
+    # go to the network start without it
+    global requests, urllib3
+    import requests
+    import urllib3
 
-def extract_dynamic_params():
+
+def fetch_with_retry(session, url, rate_limiter=None, **kwargs):
+    """
+    GETs a URL through the rate limiter, retrying 429/5xx responses and connection errors
+    with exponential backoff. Retry-After headers take precedence over the backoff delay.
+    Returns the response; raises requests.exceptions.RequestException once retries are exhausted.
+    """
+    _import_requests()
+    for attempt in range(FETCH_MAX_RETRIES + 1):
+        if rate_limiter:
+            rate_limiter.acquire()
+        delay = FETCH_BACKOFF * (2 ** attempt)
+        try:
+            res = session.get(url, timeout=FETCH_TIMEOUT, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == FETCH_MAX_RETRIES:
+                raise
+            METRICS.inc('http_retries_total', reason=e.__class__.__name__)
+            print(f"    {e.__class__.__name__} for {url}, retrying in {delay:.1f}s...")
+        else:
+            if res.status_code not in RETRY_STATUS_CODES or attempt == FETCH_MAX_RETRIES:
+                res.raise_for_status()
+                if rate_limiter:
+                    rate_limiter.speed_up()
+                return res
+            retry_after = _retry_after_seconds(res)
+            if retry_after is not None:
+                delay = retry_after
+            if rate_limiter:
+                rate_limiter.slow_down(delay)
+            METRICS.inc('http_retries_total', reason=res.status_code)
+            print(f"    HTTP {res.status_code} for {url}, retrying in {delay:.1f}s...")
+        time.sleep(delay)
+
+
+_recorded_exchanges = itertools.count(1)
+_record_prefix = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S') # Keeps recordings of several runs apart
+
+
+def record_exchange(response, *args, **kwargs):
+    """
+    requests response hook saving an HTTP exchange to RECORD_DIR as JSON.
+    Request headers are never written, so the Airtable API key stays out of recordings.
     """
-    Extracts the dynamic view_dom_id from the main events listing page.
+    body = response.request.body
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    exchange = {
+        'method': response.request.method,
+        'url': response.url,
+        'request_body': body,
+        'status': response.status_code,
+        'headers': {name: response.headers[name] for name in ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+                    if name in response.headers},
+        'body': response.text
+    }
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    path = os.path.join(RECORD_DIR, f"{_record_prefix}-{next(_recorded_exchanges):05d}-{response.request.method}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(exchange, f)
+    return response
+
+
+def _add_response_hooks(session):
+    session.hooks['response'].append(METRICS.response_hook)
+    if RECORD_DIR:
+        session.hooks['response'].append(record_exchange)
+
+
+_http_session = None
+_http_lock = threading.Lock()
+_url_locks = {}  # One lock per URL, so concurrent callers share a single download
+_response_cache = {}  # Decoded page bodies fetched during this run, keyed by URL
+_conditional_cache = None  # URL -> {'etag', 'last_modified', 'body'}, loaded from HTTP_CACHE_PATH
+
+
+def get_http_session():
+    """
+    Returns the shared requests.Session used for all INSEAD requests.
+    Its keep-alive connection pool is sized for FETCH_CONCURRENCY workers, and it
+    advertises every content encoding urllib3 can decode (gzip, plus brotli when installed).
+    """
+    global _http_session
+    if _http_session is None:
+        _import_requests()
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        _add_response_hooks(session)
+        session.headers['Accept-Encoding'] = urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(FETCH_CONCURRENCY, 1))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_session = session
+    return _http_session
+
+
+def _load_conditional_cache():
+    global _conditional_cache
+    if _conditional_cache is None:
+        _conditional_cache = {}
+        if HTTP_CACHE_PATH and os.path.exists(HTTP_CACHE_PATH):
+            try:
+                with open(HTTP_CACHE_PATH, encoding='utf-8') as f:
+                    _conditional_cache = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable HTTP cache {HTTP_CACHE_PATH}: {e}")
+    return _conditional_cache
+
+
+def _save_conditional_cache():
+    if not HTTP_CACHE_PATH:
+        return
+    try:
+        with open(HTTP_CACHE_PATH + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(_conditional_cache, f)
+        os.replace(HTTP_CACHE_PATH + '.tmp', HTTP_CACHE_PATH)
+    except OSError as e:
+        print(f"Warning: Could not write HTTP cache {HTTP_CACHE_PATH}: {e}")
+
+
+def fetch_text(url):
+    """
+    GETs a page through the shared session and returns its decoded text.
+    The body is cached for the rest of the run, so callers can share one download.
+    Across runs the ETag / Last-Modified validators are replayed, so an unchanged
+    page costs a 304 instead of a full transfer.
+    Raises requests.exceptions.RequestException on failure.
+    """
+    with _http_lock:
+        url_lock = _url_locks.setdefault(url, threading.Lock())
+    with url_lock: # Sources crawled in parallel only wait for each other on the same URL
+        if url in _response_cache:
+            return _response_cache[url]
+
+        with _http_lock:
+            cached = _load_conditional_cache().get(url)
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        res = fetch_with_retry(get_http_session(), url, headers=headers)
+        if res.status_code == 304 and cached:
+            print(f"{url} not modified since the last run, using the cached copy.")
+            METRICS.inc('http_not_modified_total')
+            text = cached['body']
+        else:
+            text = res.text
+            if res.headers.get('ETag') or res.headers.get('Last-Modified'):
+                with _http_lock:
+                    _conditional_cache[url] = {'etag': res.headers.get('ETag'),
+                                               'last_modified': res.headers.get('Last-Modified'),
+                                               'body': text}
+                    _save_conditional_cache()
+
+        _response_cache[url] = text
+        return text
+
+
+def listing_url(source=None):
+    """
+    Returns the URL of a source's listing page; MAIN_URL for the default source.
+    """
+    if source is None or source is DEFAULT_SOURCE:
+        return MAIN_URL
+    return INSEAD_BASE_URL + source.listing_path
+
+
+@METRICS.timed('extract_dynamic_params')
+def extract_dynamic_params(source=None):
+    """
+    Extracts the dynamic view_dom_id from a source's listing page (the main events listing by default).
     This ID is necessary for making subsequent AJAX requests.
     """
     try:
-        res = requests.get(MAIN_URL, headers=HEADERS)
-        res.raise_for_status() # Raise an exception for HTTP errors
-        html = res.text
+        html = fetch_text(listing_url(source)) # Shares the download made by fetch_events_from_main_page
         dom_id_match = re.search(r'js-view-dom-id-([a-f0-9]+)', html)
         if dom_id_match:
             print(f"Successfully extracted view_dom_id: {dom_id_match.group(1)}")
@@ -57,167 +404,502 @@ def extract_dynamic_params():
 def parse_date(date_str):
     """
     Parses various date string formats into ISO 8601 (YYYY-MM-DD) format.
-    Handles single dates, date ranges, and abbreviated years.
+    Handles single dates, date ranges, and abbreviated years; for ranges the start
+    date is returned (see eventdates.parse_date_range for the end date).
+    """
+    return parse_date_range(date_str)[0]
+
+
+def prepare_airtable_record(event_data, table=None):
+    """
+    Prepares event data into the dictionary format required by the Airtable API,
+    for the default table unless another AirtableTable is given.
+    Every field in the table's field map is filled from the event key of the same name.
     """
-    if not date_str:
+    table = table or default_airtable_table()
+    # Ensure 'Event Unique ID' field exists in AIRTABLE_FIELDS before accessing it
+    if 'Event Unique ID' not in table.fields:
+        print("Error: 'Event Unique ID' field ID is missing in AIRTABLE_FIELDS. Please add it.")
         return None
 
-    # Clean up the date string by removing extra spaces and normalizing separators
-    date_str = ' '.join(date_str.split())
-
-    # Define date patterns and whether they represent a range
-    date_patterns = [
-        (r'(\d{1,2})\s+([A-Za-z]+)\s+\'?(\d{2})\s*-\s*\d{1,2}\s+[A-Za-z]+\s+\'?\d{2}', True, '%d %b %Y'), # 01 Mar '25 - 30 Nov '25
-        (r'(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]+)\s+\'?(\d{2})', True, '%d %b %Y'), # 04 - 25 Jun '25
-        (r'(\d{1,2}\s+[A-Za-z]+\s+\d{4},\s+\d{1,2}:\d{2}\s+[ap]m)', False, '%d %B %Y, %I:%M %p'), # 10 June 2025, 1:00 pm
-        (r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})', False, '%d %B %Y'), # 10 June 2025
-        (r'(\d{1,2}\s+[A-Za-z]+\s+\'?\d{2})', False, '%d %b %Y'), # 12 Jun '25 or 12 Jun 25
-    ]
-
-    for pattern, is_range, date_format in date_patterns:
-        match = re.search(pattern, date_str)
-        if match:
-            try:
-                # For date ranges, extract the start date
-                if is_range:
-                    if len(match.groups()) == 4: # Pattern like '04 - 25 Jun '25'
-                        start_day = match.group(1)
-                        month = match.group(3)
-                        year = match.group(4)
-                    else: # Pattern like '01 Mar '25 - 30 Nov '25'
-                        start_day = match.group(1)
-                        month = match.group(2)
-                        year = match.group(3)
-                    temp_date_str = f"{start_day} {month} 20{year}" # Assume '25 means 2025
-                else:
-                    temp_date_str = match.group(1)
+    fields = {}
+    for key, field_id in table.fields.items():
+        if key == 'Fingerprint':
+            fields[field_id] = event_fingerprint(event_data, table)
+        else:
+            fields[field_id] = event_data.get(EVENT_KEYS.get(key, key))
+    return {"fields": fields}
 
-                # Handle abbreviated year by replacing single quote with '20'
-                if "'" in temp_date_str:
-                    temp_date_str = temp_date_str.replace("'", "20")
 
-                date_obj = datetime.strptime(temp_date_str, date_format)
-                return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                # If parsing fails for this pattern, try the next one
-                continue
-    print(f"Warning: Could not parse date string: '{date_str}'")
-    return None
+def default_airtable_table():
+    """
+    Returns the AirtableTable for AIRTABLE_API_URL and AIRTABLE_FIELDS.
+    """
+    return AirtableTable(DEFAULT_TABLE_NAME, AIRTABLE_API_URL, AIRTABLE_FIELDS, FINGERPRINT_FIELDS)
 
 
-def is_asia_related(location):
+_airtable_session = None
+
+
+def get_airtable_session():
     """
-    Checks if a location string contains keywords related to Asia.
+    Returns a pooled requests.Session carrying the Airtable auth headers.
+    The session is created once and reused so every batch shares keep-alive connections.
     """
-    if not location:
-        return False
-    asia_keywords = ['asia', 'singapore', 'china', 'japan', 'korea', 'india', 'indonesia', 'malaysia', 'thailand', 'vietnam']
-    return any(keyword in location.lower() for keyword in asia_keywords)
+    global _airtable_session
+    if _airtable_session is None:
+        _import_requests()
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"Bearer {AIRTABLE_API_KEY}",
+            "Content-Type": "application/json"
+        })
+        _add_response_hooks(session)
+        _airtable_session = session
+    return _airtable_session
+
 
+def _failed_results(custom_unique_ids, error):
+    return [{'custom_unique_id': uid, 'status': 'failed', 'record_id': None, 'error': error} for uid in custom_unique_ids]
 
-def prepare_airtable_record(event_data):
+
+def _airtable_request(session, method, url=None, **kwargs):
     """
-    Prepares event data into the dictionary format required by the Airtable API.
+    Sends a request to an Airtable table endpoint (AIRTABLE_API_URL by default), waiting and
+    retrying when the rate limit is hit. Returns the decoded JSON body; raises RequestException
+    (including Timeout after AIRTABLE_TIMEOUT seconds without a response) or ValueError.
     """
-    # Ensure 'Event Unique ID' field exists in AIRTABLE_FIELDS before accessing it
-    if 'Event Unique ID' not in AIRTABLE_FIELDS:
-        print("Error: 'Event Unique ID' field ID is missing in AIRTABLE_FIELDS. Please add it.")
-        return None
+    _import_requests()
+    for attempt in range(AIRTABLE_MAX_RETRIES + 1):
+        response = session.request(method, url or AIRTABLE_API_URL, timeout=AIRTABLE_TIMEOUT, **kwargs)
+        if response.status_code == 429 and attempt < AIRTABLE_MAX_RETRIES:
+            METRICS.inc('http_retries_total', reason=429)
+            print(f"    Airtable rate limit hit, waiting {AIRTABLE_RATE_LIMIT_WAIT}s before retrying...")
+            time.sleep(AIRTABLE_RATE_LIMIT_WAIT)
+            continue
+        response.raise_for_status()
+        return response.json()
+
 
-    return {
-        "fields": {
-            AIRTABLE_FIELDS['event']: event_data.get('event', ''),
-            AIRTABLE_FIELDS['Month & Day']: event_data.get('Month & Day'), # Can be None
-            AIRTABLE_FIELDS['location']: event_data.get('location', ''),
-            AIRTABLE_FIELDS['eventurl']: event_data.get('eventurl', ''),
-            AIRTABLE_FIELDS['Added At']: event_data.get('Added At', ''),
-            AIRTABLE_FIELDS['AsiaRelated']: event_data.get('AsiaRelated', False),
-            AIRTABLE_FIELDS['Event Unique ID']: event_data.get('custom_unique_id', '') # Add the new custom unique ID field
-        }
+def _upsert_airtable_batch(session, batch, table):
+    """
+    Upserts up to AIRTABLE_BATCH_SIZE records in a single PATCH request, merging on the
+    "Event Unique ID" field. Returns one result dict per record in the batch.
+    """
+    unique_field = table.fields['Event Unique ID']
+    custom_unique_ids = [record['fields'][unique_field] for record in batch]
+    payload = {
+        "performUpsert": {"fieldsToMergeOn": [unique_field]},
+        "returnFieldsByFieldId": True,  # Lets us map the response back by field ID
+        "records": [{"fields": record['fields']} for record in batch]
     }
 
+    try:
+        data = _airtable_request(session, 'PATCH', table.api_url, json=payload)
+    except requests.exceptions.RequestException as e:
+        return _failed_results(custom_unique_ids, str(e))
+    except ValueError as e: # Catch JSON decoding errors
+        return _failed_results(custom_unique_ids, f"Invalid JSON response: {e}")
+
+    created_ids = set(data.get('createdRecords', []))
+    results = []
+    for airtable_record in data.get('records', []):
+        results.append({
+            'custom_unique_id': airtable_record.get('fields', {}).get(unique_field, ''),
+            'status': 'created' if airtable_record['id'] in created_ids else 'updated',
+            'record_id': airtable_record['id'],
+            'error': None
+        })
+    return results
 
+
+@METRICS.timed('fetch_airtable_index')
+def fetch_airtable_index(field_keys=('Event Unique ID',), session=None, table=None):
+    """
+    Pages through the Airtable table (the default one unless given) once and builds an
+    in-memory index of existing records.
+    Only the fields named in field_keys (keys of the table's field map) are requested.
+    Returns a dict mapping custom unique ID -> {'id': record_id, 'fields': {field_id: value}},
+    or None if the table could not be read.
+    """
+    session = session or get_airtable_session()
+    table = table or default_airtable_table()
+    unique_field = table.fields['Event Unique ID']
+    field_ids = [table.fields[key] for key in field_keys]
+    if unique_field not in field_ids:
+        field_ids.append(unique_field)
+    params = {'fields[]': field_ids, 'pageSize': AIRTABLE_PAGE_SIZE, 'returnFieldsByFieldId': 'true'}
+
+    index = {}
+    while True:
+        try:
+            data = _airtable_request(session, 'GET', table.api_url, params=params)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error loading existing Airtable records: {e}")
+            return None
+        for airtable_record in data.get('records', []):
+            custom_unique_id = airtable_record.get('fields', {}).get(unique_field)
+            if custom_unique_id:
+                index[custom_unique_id] = {'id': airtable_record['id'], 'fields': airtable_record['fields']}
+        if not data.get('offset'):
+            return index
+        params['offset'] = data['offset']
+
+
+def _fingerprint(values):
+    # Airtable omits empty fields, unchecked checkboxes and empty selections, so None, '', False and [] hash the same
+    normalized = [value if value not in (None, '', False, []) else None for value in values]
+    return hashlib.sha1(json.dumps(normalized).encode('utf-8')).hexdigest()
+
+
+def event_fingerprint(event_data, table=None):
+    """
+    Returns a content fingerprint of an event over FINGERPRINT_FIELDS, or over the
+    fingerprinted fields of the given table.
+    """
+    return _fingerprint([event_data.get(key) for key in (table.fingerprint_fields if table else FINGERPRINT_FIELDS)])
+
+
+def airtable_fingerprint(fields, table=None):
+    """
+    Returns the content fingerprint of a record's Airtable fields (keyed by field ID).
+    Uses the stored 'Fingerprint' field when configured, otherwise hashes the fingerprinted fields.
+    """
+    table = table or default_airtable_table()
+    if 'Fingerprint' in table.fields and fields.get(table.fields['Fingerprint']):
+        return fields[table.fields['Fingerprint']]
+    return _fingerprint([fields.get(table.fields[key]) for key in table.fingerprint_fields])
+
+
+def airtable_index_field_keys(table=None):
+    """
+    Returns the field map keys the index of a table needs for change detection.
+    """
+    table = table or default_airtable_table()
+    if 'Fingerprint' in table.fields:
+        return ['Fingerprint'] + [key for key in ('Added At',) if key in table.fields]
+    return table.fingerprint_fields + [key for key in ('Added At',) if key in table.fields]
+
+
+def _unchanged_result(record, index, table):
+    # Returns an 'unchanged' result if the record matches its indexed Airtable record, else None
+    if index is None:
+        return None
+    custom_unique_id = record['fields'][table.fields['Event Unique ID']]
+    indexed_record = index.get(custom_unique_id)
+    if indexed_record and airtable_fingerprint(record['fields'], table) == \
+            (indexed_record.get('fingerprint') or airtable_fingerprint(indexed_record['fields'], table)):
+        return {'custom_unique_id': custom_unique_id, 'status': 'unchanged', 'record_id': indexed_record['id'], 'error': None}
+    return None
+
+
+@METRICS.timed('sync_airtable_records')
+def sync_airtable_records(records, session=None, index=None, table=None):
+    """
+    Creates or updates Airtable records in batches of AIRTABLE_BATCH_SIZE using Airtable's
+    upsert mode, keyed on the "Event Unique ID" field, in the default table unless one is given.
+    If an index from fetch_airtable_index is given, records whose content fingerprint matches
+    their existing Airtable record are not written and are reported as 'unchanged', and
+    updates keep the existing 'Added At' value.
+    Returns a list of per-record result dicts with the keys 'custom_unique_id',
+    'status' ('created', 'updated', 'unchanged' or 'failed'), 'record_id' and 'error'.
+    """
+    session = session or get_airtable_session()
+    table = table or default_airtable_table()
+    unique_field = table.fields['Event Unique ID']
+
+    # Airtable rejects a batch that contains the same merge key twice, so keep the last
+    # version of each record (different titles can normalise to the same unique ID).
+    records_by_id = {}
+    for record in records:
+        records_by_id[record['fields'][unique_field]] = record
+
+    results = []
+    pending = []
+    for custom_unique_id, record in records_by_id.items():
+        indexed_record = index.get(custom_unique_id) if index is not None else None
+        unchanged_result = _unchanged_result(record, index, table)
+        if indexed_record is None:
+            pending.append(record)
+        elif unchanged_result:
+            results.append(unchanged_result)
+        else:
+            # Leave 'Added At' out of the update so Airtable keeps the first-seen timestamp
+            fields = {k: v for k, v in record['fields'].items() if k != table.fields.get('Added At')}
+            records_by_id[custom_unique_id] = {'fields': fields}
+            pending.append(records_by_id[custom_unique_id])
+
+    for start in range(0, len(pending), AIRTABLE_BATCH_SIZE):
+        batch_results = _upsert_airtable_batch(session, pending[start:start + AIRTABLE_BATCH_SIZE], table)
+        if index is not None:
+            for result in batch_results:
+                if result['status'] != 'failed':
+                    fields = dict(index.get(result['custom_unique_id'], {}).get('fields', {}))
+                    fields.update(records_by_id[result['custom_unique_id']]['fields'])
+                    index[result['custom_unique_id']] = {'id': result['record_id'], 'fields': fields}
+        results.extend(batch_results)
+    for result in results:
+        METRICS.inc('airtable_records_total', status=result['status'], table=table.name)
+    return results
+
+
+@METRICS.timed('manage_airtable_record')
 def manage_airtable_record(record):
     """
-    Checks if a record exists in Airtable by custom unique ID. If it exists, it updates it.
-    If it doesn't exist, it creates a new record.
-    Returns the Airtable record ID.
+    Creates or updates a single record in Airtable, matched by custom unique ID.
+    Returns the Airtable record ID, or None if the upsert failed.
+    Prefer sync_airtable_records for more than one record, as it batches the writes.
     """
-    headers = {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
+    result = sync_airtable_records([record])[0]
+    if result['status'] == 'failed':
+        print(f"    ✗ Airtable API error for Unique ID {result['custom_unique_id']}: {result['error']}")
+    else:
+        print(f"    ✓ {result['status'].capitalize()} Airtable record with ID: {result['record_id']} for Unique ID: {result['custom_unique_id']}")
+    return result['record_id']
+
+
+def build_event(title, link, date_str, location, current_time):
+    """
+    Builds an event record from the raw text fields of an event card.
+    Returns None for cards without a URL.
+    """
+    if link and not link.startswith('http'):
+        link = SITE_URL + link
+    if not link: # Only keep events with a valid URL
+        return None
+    title = ' '.join(title.split())
+
+    parse_start = time.perf_counter()
+    start_date, end_date = parse_date_range(date_str)
+    METRICS.inc('parse_date_seconds_total', time.perf_counter() - parse_start)
+    METRICS.inc('parse_date_calls_total')
+    event_data = {
+        'event': title,
+        'Month & Day': start_date,
+        'End Date': end_date,
+        'location': location,
+        'eventurl': link,
+        'Added At': current_time,
+        'AsiaRelated': is_asia_related(location),
+        'Region': list(classify_location(location))
     }
-    custom_unique_id = record['fields'][AIRTABLE_FIELDS['Event Unique ID']]
+    # Generate a unique ID based on title and canonical URL for Airtable; it is also the in-memory
+    # dedup key, so links to one event differing in tracking parameters or trailing slash match
+    if event_data['event'] and event_data['eventurl']:
+        event_data['custom_unique_id'] = canonical_key(event_data['event'], event_data['eventurl'])
+    else:
+        event_data['custom_unique_id'] = '' # Ensure it's not None if title/URL is missing
+    return event_data
 
-    # Check if the event with this custom unique ID already exists in Airtable
-    try:
-        # We need to use the actual Airtable field name for the filter, not the internal key
-        unique_id_field_name = [k for k, v in AIRTABLE_FIELDS.items() if v == AIRTABLE_FIELDS['Event Unique ID']][0]
 
-        response = requests.get(AIRTABLE_API_URL, headers=headers, params={'filterByFormula': f"{{{unique_id_field_name}}}='{custom_unique_id}'"})
-        response.raise_for_status()
-        existing_records = response.json().get('records', [])
-
-        if existing_records:
-            record_id = existing_records[0]['id']
-            # Update the existing record
-            update_response = requests.patch(f"{AIRTABLE_API_URL}/{record_id}", headers=headers, json={"fields": record['fields']})
-            update_response.raise_for_status()
-            print(f"    ✓ Updated existing Airtable record with ID: {record_id} for Unique ID: {custom_unique_id}")
-            return record_id
+def _join_date_parts(parts):
+    return ' '.join(part.strip() for part in parts if part.strip() and part.strip() != '-')
+
+
+def _iter_cards_bs4(html, selectors):
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.select(selectors['card']):
+        title_tag = card.select_one(selectors['title'])
+        title = title_tag.get_text(strip=True) if title_tag else ''
+        link = title_tag['href'] if title_tag and title_tag.has_attr('href') else ''
+
+        date_str = ''
+        date_container = card.select_one(selectors['date_label'])
+        if date_container:
+            date_str = _join_date_parts(date_container.stripped_strings)
+        else: # Fallback to the other selector if the primary one isn't found
+            date_tag = card.select_one(selectors['date_fallback'])
+            if date_tag:
+                date_str = date_tag.get_text(strip=True)
+
+        location_tag = card.select_one(selectors['location'])
+        location = location_tag.get_text(strip=True) if location_tag else ''
+        yield title, link, date_str, location
+
+
+def _iter_cards_selectolax(html, selectors):
+    tree = selectolax.lexbor.LexborHTMLParser(html)
+    for card in tree.css(selectors['card']):
+        title_tag = card.css_first(selectors['title'])
+        title = title_tag.text(separator='', strip=True) if title_tag else ''
+        link = (title_tag.attributes.get('href') or '') if title_tag else ''
+
+        date_str = ''
+        date_container = card.css_first(selectors['date_label'])
+        if date_container:
+            date_str = _join_date_parts(date_container.text(separator='\n', strip=True).split('\n'))
         else:
-            # Create a new record
-            create_response = requests.post(AIRTABLE_API_URL, headers=headers, json=record)
-            create_response.raise_for_status()
-            record_id = create_response.json()['id']
-            print(f"    ✓ Created new Airtable record with ID: {record_id} for Unique ID: {custom_unique_id}")
-            return record_id
-    except requests.exceptions.RequestException as e:
-        print(f"    ✗ Airtable API error for Unique ID {custom_unique_id}: {e}")
-        return None
+            date_tag = card.css_first(selectors['date_fallback'])
+            if date_tag:
+                date_str = date_tag.text(separator='', strip=True)
 
+        location_tag = card.css_first(selectors['location'])
+        location = location_tag.text(separator='', strip=True) if location_tag else ''
+        yield title, link, date_str, location
 
-def fetch_events_from_ajax(view_dom_id, page=0):
-    """
-    Fetches events from the AJAX endpoint for a specific page.
-    """
-    libraries = "" # This might need to be dynamically extracted or kept empty if not critical
-    params = {
-        '_wrapper_format': 'drupal_ajax',
-        'view_name': 'events_listing',
-        'view_display_id': 'events_listing',
-        'view_args': '',
-        'view_path': '/events/listing',
-        'view_base_path': 'events/listing',
-        'view_dom_id': view_dom_id,
-        'pager_element': 0,
-        'page': page, # This 'page' parameter controls the AJAX pagination
-        '_drupal_ajax': 1,
-        'ajax_page_state[theme]': 'insead_core',
-        'ajax_page_state[theme_token]': '',
-        'ajax_page_state[libraries]': libraries
-    }
+
+_lxml_selectors = {}
+
+
+def _lxml_select(element, selector):
+    # CSS selectors are translated to XPath once and reused for every card
+    compiled = _lxml_selectors.get(selector)
+    if compiled is None:
+        compiled = _lxml_selectors[selector] = lxml.cssselect.CSSSelector(selector)
+    return compiled(element)
+
+
+def _iter_cards_lxml(html, selectors):
+    if not html or not html.strip():
+        return
+    if isinstance(html, bytes):
+        # lxml reads bytes without a charset declaration as Latin-1; the other backends read UTF-8
+        html = html.decode('utf-8', 'replace')
+    root = lxml.html.fromstring(html)
+    for card in _lxml_select(root, selectors['card']):
+        title_tags = _lxml_select(card, selectors['title'])
+        title = ''.join(text.strip() for text in title_tags[0].itertext()) if title_tags else ''
+        link = (title_tags[0].get('href') or '') if title_tags else ''
+
+        date_str = ''
+        date_containers = _lxml_select(card, selectors['date_label'])
+        if date_containers:
+            date_str = _join_date_parts(date_containers[0].itertext())
+        else:
+            date_tags = _lxml_select(card, selectors['date_fallback'])
+            if date_tags:
+                date_str = ''.join(text.strip() for text in date_tags[0].itertext())
+
+        location_tags = _lxml_select(card, selectors['location'])
+        location = ''.join(text.strip() for text in location_tags[0].itertext()) if location_tags else ''
+        yield title, link, date_str, location
+
+
+def _import_bs4():
+    global BeautifulSoup
+    from bs4 import BeautifulSoup
+
+
+def _import_selectolax():
+    global selectolax
+    import selectolax.lexbor # The lexbor engine; the older modest engine is deprecated
+
+
+def _import_lxml():
+    global lxml
+    import lxml.html
+    import lxml.cssselect # Needs the cssselect package to translate CSS to XPath
+
+
+PARSER_BACKENDS = {
+    # name: (importer, card iterator), fastest first
+    'selectolax': (_import_selectolax, _iter_cards_selectolax),
+    'lxml': (_import_lxml, _iter_cards_lxml),
+    'bs4': (_import_bs4, _iter_cards_bs4)
+}
+_available_backends = {}
+
+
+def _load_parser_backend(name):
+    # Returns the card iterator of an installed backend, or None if its library is missing
+    if name not in _available_backends:
+        importer, iterator = PARSER_BACKENDS[name]
+        try:
+            importer()
+            _available_backends[name] = iterator
+        except ImportError:
+            _available_backends[name] = None
+    return _available_backends[name]
+
+
+def available_parser_backends():
+    """
+    Returns the names of the installed parser backends, fastest first.
+    """
+    return [name for name in PARSER_BACKENDS if _load_parser_backend(name)]
+
+
+_resolved_backends = {}  # requested name -> (name, card iterator)
+
+
+def get_parser_backend(name=None):
+    """
+    Returns (name, card iterator) for the requested parser backend.
+    'auto' picks the first installed backend in PARSER_BACKENDS order; bs4 is always available.
+    The choice is resolved once per requested name, so a fallback is only reported once.
+    """
+    name = name or PARSER_BACKEND
+    if name not in _resolved_backends:
+        for candidate in (list(PARSER_BACKENDS) if name == 'auto' else [name]):
+            if candidate in PARSER_BACKENDS and _load_parser_backend(candidate):
+                _resolved_backends[name] = candidate, _available_backends[candidate]
+                break
+        else:
+            print(f"Warning: Parser backend '{name}' is not installed, falling back to bs4.")
+            _resolved_backends[name] = 'bs4', _load_parser_backend('bs4')
+    return _resolved_backends[name]
+
+
+def extract_events(html, current_time=None, backend=None, selectors=None):
+    """
+    Parses event cards out of an HTML page or fragment (str or bytes) and yields
+    event records, using the fastest installed parser backend unless one is given.
+    """
+    current_time = current_time or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    _, iter_cards = get_parser_backend(backend)
+    for title, link, date_str, location in iter_cards(html, selectors or CARD_SELECTORS):
+        event_data = build_event(title, link, date_str, location, current_time)
+        if event_data:
+            yield event_data
+
+
+def _source_selectors(source):
+    if source is None or not source.selectors:
+        return CARD_SELECTORS
+    return {**CARD_SELECTORS, **source.selectors}
+
+
+def _tag_source(events, source):
+    # Adds the source's extra fields to its events and records which sources listed them
+    source = source or DEFAULT_SOURCE
+    for event in events:
+        event.update(source.fields)
+        event['sources'] = [source.name]
+    return events
+
+
+@METRICS.timed('fetch_events_from_ajax')
+def fetch_events_from_ajax(view_dom_id, page=0, session=None, rate_limiter=None, source=None):
+    """
+    Fetches events from the AJAX endpoint for a specific page of a source's view
+    (the main events listing by default).
+    Transient failures are retried by fetch_with_retry; returns None for a page that still fails,
+    so that it is not mistaken for the empty page past the end of the listing.
+    """
+    source = source or DEFAULT_SOURCE
+    params = source.ajax_params(view_dom_id, page)
 
     # Create a dynamic set of headers for this request
     dynamic_headers = HEADERS.copy()
     # Set the Referer header based on the current page for AJAX calls
     # Referer should typically match the page from which the AJAX call is initiated
-    dynamic_headers["Referer"] = f"{MAIN_URL}?page={page}"
+    dynamic_headers["Referer"] = f"{listing_url(source)}?page={page}"
 
     try:
         # Changed to GET request based on network log analysis
-        res = requests.get(AJAX_URL, headers=dynamic_headers, params=params) # Pass params as 'params' for GET
-        res.raise_for_status()
+        res = fetch_with_retry(session or get_http_session(), AJAX_URL, rate_limiter, headers=dynamic_headers, params=params) # Pass params as 'params' for GET
         data = res.json()
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching AJAX page {page}: {e}")
-        return []
+        print(f"Error fetching {source.name} AJAX page {page}: {e}")
+        METRICS.inc('page_fetch_errors_total', listing=source.name)
+        return None
     except ValueError as e: # Catch JSON decoding errors
-        print(f"Error decoding JSON response from AJAX page {page}: {e}. Response was: {res.text[:200]}...")
-        return []
+        print(f"Error decoding JSON response from {source.name} AJAX page {page}: {e}. Response was: {res.text[:200]}...")
+        METRICS.inc('page_fetch_errors_total', listing=source.name)
+        return None
 
     events = []
-    current_time = datetime.now(pytz.UTC).strftime('%Y-%m-%d %H:%M:%S')
+    current_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
     for item in data:
         if 'data' in item and item['data']: # Ensure 'data' key exists and is not empty
@@ -225,214 +907,837 @@ def fetch_events_from_ajax(view_dom_id, page=0):
             if isinstance(html_data, list):
                 # Concatenate list of HTML strings if present
                 html_data = ''.join([x for x in html_data if isinstance(x, str)])
+            if not isinstance(html_data, str): # e.g. settings commands carry a dict
+                continue
 
-            soup = BeautifulSoup(html_data, 'html.parser')
-            for card in soup.select('.event-card-full'):
-                title_tag = card.select_one('.h5__link.list-object__heading-link')
-                title = title_tag.get_text(strip=True) if title_tag else ''
-                link = title_tag['href'] if title_tag and title_tag.has_attr('href') else ''
-                if link and not link.startswith('http'):
-                    link = 'https://www.insead.edu' + link
-
-                date_str = ''
-                # Prioritize the more robust date container selector for AJAX calls
-                date_container = card.select_one('.event__date-container__label')
-                if date_container:
-                    date_parts = [part.strip() for part in date_container.stripped_strings if part.strip() and part.strip() != '-']
-                    date_str = ' '.join(date_parts)
-                else: # Fallback to the other selector if the primary one isn't found
-                    date_tag = card.select_one('.event-card-full__datetime .link')
-                    if date_tag:
-                        date_str = date_tag.get_text(strip=True)
-
-
-                location_tag = card.select_one('.event-card-full__location .link')
-                location = location_tag.get_text(strip=True) if location_tag else ''
-
-                event_data = {
-                    'event': title,
-                    'Month & Day': parse_date(date_str),
-                    'location': location,
-                    'eventurl': link,
-                    'Added At': current_time,
-                    'AsiaRelated': is_asia_related(location)
-                }
-                # Generate a unique ID based on title and URL for Airtable
-                if event_data['event'] and event_data['eventurl']:
-                    # Normalize title for consistent unique ID generation (e.g., lowercase, remove non-alphanumeric)
-                    normalized_title = re.sub(r'[^a-z0-9]', '', event_data['event'].lower())
-                    event_data['custom_unique_id'] = f"{normalized_title}-{event_data['eventurl']}"
-                else:
-                    event_data['custom_unique_id'] = '' # Ensure it's not None if title/URL is missing
-
-                if event_data['eventurl']: # Only add events with a valid URL
-                    events.append(event_data)
-    return events
+            with METRICS.timer('parse_cards'):
+                events.extend(extract_events(html_data, current_time, selectors=_source_selectors(source)))
+    METRICS.observe('cards_per_page', len(events), COUNT_BUCKETS, source='ajax', listing=source.name)
+    return _tag_source(events, source)
 
 
-def fetch_events_from_main_page():
+@METRICS.timed('fetch_events_from_main_page')
+def fetch_events_from_main_page(source=None):
     """
-    Fetches events visible on the initial load of the main events listing page.
+    Fetches events visible on the initial load of a source's listing page
+    (the main events listing by default).
     """
+    source = source or DEFAULT_SOURCE
     try:
-        # Use existing HEADERS for main page GET request
-        res = requests.get(MAIN_URL, headers=HEADERS)
-        res.raise_for_status()
-        html = res.text
+        html = fetch_text(listing_url(source))
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching main page for initial events: {e}")
+        print(f"Error fetching {source.name} listing page for initial events: {e}")
+        METRICS.inc('page_fetch_errors_total', listing=source.name)
         return []
 
-    soup = BeautifulSoup(html, 'html.parser')
-    events = []
-    current_time = datetime.now(pytz.UTC).strftime('%Y-%m-%d %H:%M:%S')
+    with METRICS.timer('parse_cards'):
+        events = list(extract_events(html, selectors=_source_selectors(source)))
+    METRICS.observe('cards_per_page', len(events), COUNT_BUCKETS, source='main_page', listing=source.name)
+    return _tag_source(events, source)
 
-    for card in soup.select('.event-card-full'):
-        title_tag = card.select_one('.h5__link.list-object__heading-link')
-        title = title_tag.get_text(strip=True) if title_tag else ''
-        link = title_tag['href'] if title_tag and title_tag.has_attr('href') else ''
-        if link and not link.startswith('http'):
-            link = 'https://www.insead.edu' + link
 
-        date_str = ''
-        # Prioritize the more robust date container selector for main page
-        date_container = card.select_one('.event__date-container__label')
-        if date_container:
-            date_parts = [part.strip() for part in date_container.stripped_strings if part.strip() and part.strip() != '-']
-            date_str = ' '.join(date_parts)
-        else: # Fallback to the other selector if the primary one isn't found
-            date_tag = card.select_one('.event-card-full__datetime .link')
-            if date_tag:
-                date_str = date_tag.get_text(strip=True)
+def is_known_page(events, known_fingerprints):
+    """
+    Returns True if a page has events and every identifiable one is already known
+    with the same content fingerprint.
+    """
+    identified = [event for event in events if event.get('custom_unique_id')]
+    return bool(identified) and all(
+        known_fingerprints.get(event['custom_unique_id']) == event_fingerprint(event) for event in identified)
 
-        location_tag = card.select_one('.event-card-full__location .link')
-        location = location_tag.get_text(strip=True) if location_tag else ''
 
-        event_data = {
-            'event': title,
-            'Month & Day': parse_date(date_str),
-            'location': location,
-            'eventurl': link,
-            'Added At': current_time,
-            'AsiaRelated': is_asia_related(location)
-        }
-        # Generate a unique ID based on title and URL for Airtable
-        if event_data['event'] and event_data['eventurl']:
-            normalized_title = re.sub(r'[^a-z0-9]', '', event_data['event'].lower())
-            event_data['custom_unique_id'] = f"{normalized_title}-{event_data['eventurl']}"
-        else:
-            event_data['custom_unique_id'] = '' # Ensure it's not None if title/URL is missing
+class UniquePageFilter:
+    """
+    Per-stream state of the deduplication in aiter_unique_events: feeds each page through a
+    shared DedupIndex and decides when the stream has reached the end of new content.
+    Reaching it counts the stream's listing in listings_completed_total.
+    """
 
-        if event_data['eventurl']: # Only add events with a valid URL
-            events.append(event_data)
-    return events
+    def __init__(self, dedup=None, known_fingerprints=None, stop_after_known_pages=0, listing=None):
+        self.dedup = DedupIndex() if dedup is None else dedup
+        self.known_fingerprints = known_fingerprints
+        self.stop_after_known_pages = stop_after_known_pages
+        self.listing = listing or DEFAULT_SOURCE.name
+        self.seen_keys = set() # Keys listed by this stream, for its own end-of-content check
+        self.known_pages = 0
+
+    def add_page(self, page, events):
+        """
+        Adds the events of a page. Returns (events, stop): the new or changed events as copies,
+        and whether the stream should stop pulling pages.
+        """
+        updated_events = []
+        events_added_this_page = 0
+        for event in events:
+            unique_key = event.get('custom_unique_id')
+            if not unique_key: # Needs both title and URL
+                continue
+            if unique_key not in self.seen_keys:
+                self.seen_keys.add(unique_key)
+                events_added_this_page += 1
+            updated_event, is_new = self.dedup.add(event)
+            if is_new:
+                METRICS.inc('unique_events_total')
+            if updated_event is not None:
+                updated_events.append(updated_event)
 
+        if page == 0:
+            return updated_events, False
+        print(f"Added {events_added_this_page} new unique events from AJAX page {page}.")
 
-def fetch_all_events_hybrid():
+        # This stopping condition is crucial. If a page returns 0 new unique events,
+        # it usually means we've reached the end of the unique paginated content.
+        if events_added_this_page == 0:
+            print("No new unique events found on this AJAX page. Assuming end of content.")
+            METRICS.inc('listings_completed_total', listing=self.listing)
+            return updated_events, True
+
+        if self.known_fingerprints is not None and self.stop_after_known_pages > 0:
+            self.known_pages = self.known_pages + 1 if is_known_page(events, self.known_fingerprints) else 0
+            if self.known_pages >= self.stop_after_known_pages:
+                print(f"{self.known_pages} consecutive pages held only known, unchanged events. Stopping incremental crawl.")
+                return updated_events, True
+        return updated_events, False
+
+
+def journal_event(event, store):
     """
-    Fetches events from both the main page and iterates through all AJAX pages.
-    Deduplicates and merges event data.
+    Records an event in the local event store and returns it with 'Added At' restored
+    to the time it was first seen.
     """
-    events_dict = {}
+    if event.get('custom_unique_id'):
+        event['Added At'] = store.record_seen(event, event_fingerprint(event), event['Added At'])
+    return event
+
 
-    # 1. Fetch events from the main page first
-    print("Fetching events from the main page...")
-    main_page_events = fetch_events_from_main_page()
-    for event in main_page_events:
-        if event.get('eventurl') and event.get('event'):
-            # Use a tuple of (event_title, event_url) as the unique key for in-memory deduplication
-            unique_key = (event['event'], event['eventurl'])
-            events_dict[unique_key] = event 
-    print(f"Found {len(main_page_events)} events on the main page.")
+def _route_event(i, event, routes, default_tables):
+    # Prints the i-th event and returns its (table, Airtable record) pairs
+    print(f"\n{i}. Event Data (Airtable Format):")
+    print(f"    Title: {event.get('event', 'N/A')}")
+    print(f"    Date: {event.get('Month & Day', 'N/A')}")
+    print(f"    Location: {event.get('location', 'N/A')}")
+    print(f"    URL: {event.get('eventurl', 'N/A')}")
+    print(f"    Added At: {event.get('Added At', 'N/A')}")
+    print(f"    Asia Related: {event.get('AsiaRelated', 'N/A')}")
+    print(f"    Event Unique ID: {event.get('custom_unique_id', 'N/A')}")
 
-    # 2. Extract dynamic parameters for AJAX pagination
-    view_dom_id = extract_dynamic_params()
+    # Ensure eventurl and custom_unique_id are present before trying to manage in Airtable
+    if not (event.get('eventurl') and event.get('custom_unique_id')):
+        print(f"    ✗ Skipping event due to missing URL or Custom Unique ID: {event.get('event', 'N/A')}")
+        return []
+
+    if routes is None:
+        tables = default_tables
+    else:
+        tables = {}
+        for source_name in event.get('sources') or [DEFAULT_SOURCE.name]:
+            for table in routes.get(source_name, ()):
+                tables[table.name] = table
+        tables = tables.values()
+    routed = []
+    for table in tables:
+        airtable_record = prepare_airtable_record(event, table)
+        # Ensure airtable_record is not None (e.g., if AIRTABLE_FIELDS was not correctly set up)
+        if airtable_record is None:
+            print(f"Skipping event {i} for {table.name} due to Airtable record preparation error.")
+            continue
+        routed.append((table, airtable_record))
+    return routed
+
+
+def load_sources():
+    """
+    Returns (sources, tables) for this run: DEFAULT_SOURCE syncing to the default table, plus
+    the sources and tables defined in SOURCES_PATH (its sources replace DEFAULT_SOURCE when it lists any).
+    Raises ValueError for sources that sync to unknown tables, and load_config's errors.
+    """
+    sources, tables = [DEFAULT_SOURCE], {DEFAULT_TABLE_NAME: default_airtable_table()}
+    if SOURCES_PATH:
+        configured_sources, configured_tables = load_config(SOURCES_PATH)
+        sources = configured_sources or sources
+        tables.update(configured_tables)
+    for source in sources:
+        unknown_tables = [name for name in source.tables if name not in tables]
+        if unknown_tables:
+            raise ValueError(f"Source '{source.name}' syncs to unknown Airtable tables: {unknown_tables}")
+    return sources, tables
+
+
+async def aiter_listing_pages(source=None, rate_limiter=None, semaphore=None):
+    """
+    Yields (page_number, events) for a source's listing page (page 0) and then every AJAX page
+    in order; the source defaults to the main events listing.
+    The blocking requests run in the event loop's default executor, at most FETCH_CONCURRENCY
+    at a time across all sources sharing the semaphore, with FETCH_PREFETCH_PAGES pages requested
+    ahead of the consumer, so parsing and uploading downstream overlap with the crawl while
+    memory stays bounded. Stops after the first empty AJAX page, counting the source in
+    listings_completed_total as crawled to its end; consumers can stop earlier by
+    closing the generator, which cancels the requests that have not started yet.
+    AJAX pages that still fail after retries are skipped (and counted in page_fetch_errors_total);
+    after FETCH_MAX_SKIPPED_PAGES of them in a row pagination is abandoned.
+    """
+    source = source or DEFAULT_SOURCE
+    rate_limiter = rate_limiter or TokenBucket(FETCH_RATE, FETCH_BURST)
+    semaphore = semaphore or asyncio.Semaphore(max(FETCH_CONCURRENCY, 1))
+
+    async def fetch(func, *args):
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    print(f"Fetching events from the {source.name} listing page...")
+    main_page_events = await fetch(fetch_events_from_main_page, source)
+    print(f"Found {len(main_page_events)} events on the {source.name} listing page.")
+    yield 0, main_page_events
+
+    view_dom_id = await asyncio.to_thread(extract_dynamic_params, source)
     if not view_dom_id:
         print("Cannot proceed with AJAX fetching due to missing view_dom_id.")
-        return list(events_dict.values()) # Return only main page events if AJAX fails
+        return # Only main page events if AJAX fails
 
-    # 3. Fetch events from AJAX pages
+    session = get_http_session()
+    pending_pages = {}
+    next_page = 1
     page = 1 # Start AJAX pagination from page 1, assuming page 0 content is similar to main page
-    while True:
-        print(f"Fetching events from AJAX page {page}...")
-        ajax_events = fetch_events_from_ajax(view_dom_id, page)
+    skipped_pages = 0
+    try:
+        while True:
+            while next_page <= page + max(FETCH_PREFETCH_PAGES, 1) - 1:
+                pending_pages[next_page] = asyncio.ensure_future(
+                    fetch(fetch_events_from_ajax, view_dom_id, next_page, session, rate_limiter, source))
+                next_page += 1
 
-        if not ajax_events:
-            print(f"No more events found on AJAX page {page}. Stopping pagination.")
-            break # No more events, stop pagination
+            print(f"Fetching events from {source.name} AJAX page {page}...")
+            ajax_events = await pending_pages.pop(page)
+            if ajax_events is None:
+                skipped_pages += 1
+                if skipped_pages >= FETCH_MAX_SKIPPED_PAGES:
+                    print(f"{skipped_pages} consecutive {source.name} AJAX pages failed. Abandoning pagination.")
+                    return
+                print(f"Skipping {source.name} AJAX page {page}, which could not be fetched.")
+                page += 1
+                continue
+            skipped_pages = 0
+            if not ajax_events:
+                print(f"No more events found on {source.name} AJAX page {page}. Stopping pagination.")
+                METRICS.inc('listings_completed_total', listing=source.name)
+                return # No more events, stop pagination
 
-        # Process events from the current AJAX page
-        events_added_this_page = 0
-        for event in ajax_events:
-            if event.get('eventurl') and event.get('event'): # Ensure both title and URL are present
-                unique_key = (event['event'], event['eventurl'])
-                if unique_key not in events_dict:
-                    # New event, add it
-                    events_dict[unique_key] = event
-                    events_added_this_page += 1
-                else:
-                    # Event already exists (based on title AND URL), intelligently merge missing data
-                    existing_event = events_dict[unique_key]
-                    for field_name, new_value in event.items():
-                        # Update if existing value is None or empty, AND new_value is not None/empty
-                        # Or if AsiaRelated is False (default) and a new source says True
-                        if (existing_event.get(field_name) is None or existing_event.get(field_name) == '' or \
-                            (field_name == 'AsiaRelated' and existing_event.get('AsiaRelated') is False)) \
-                           and new_value is not None and new_value != '':
-                            existing_event[field_name] = new_value
+            yield page, ajax_events
+            page += 1
+    finally:
+        for task in pending_pages.values():
+            task.cancel()
 
-        print(f"Added {events_added_this_page} new unique events from AJAX page {page}.")
 
-        # This stopping condition is crucial. If a page returns 0 new unique events,
-        # it usually means we've reached the end of the unique paginated content.
-        if events_added_this_page == 0:
-             print("No new unique events found on this AJAX page. Assuming end of content.")
-             break
+async def aiter_unique_events(pages, dedup=None, known_fingerprints=None, stop_after_known_pages=0, listing=None):
+    """
+    Deduplicates and merges the events of a page stream through a DedupIndex. Each event is
+    yielded when it is first seen, and again whenever a later sighting changes it under the
+    index's merge policy; yielded events are copies, so the streams of several sources can
+    share one index.
+    Stops pulling pages once an AJAX page adds no events new to this stream.
+    In incremental mode (known_fingerprints maps custom unique ID -> fingerprint from earlier
+    runs), it also stops after stop_after_known_pages consecutive pages of known, unchanged events.
+    listing names the source of the pages in the metrics (the main events listing by default).
+    """
+    page_filter = UniquePageFilter(dedup, known_fingerprints, stop_after_known_pages, listing)
+    try:
+        async for page, events in pages:
+            updated_events, stop = page_filter.add_page(page, events)
+            for event in updated_events:
+                yield event
+            if stop:
+                break
+    finally:
+        await pages.aclose() # Stop the crawl and cancel its outstanding requests
 
-        page += 1
-        time.sleep(2) # Be polite and avoid overwhelming the server
 
-    # Convert dictionary values back to a list
-    return list(events_dict.values())
+_crawl_done = object() # Queued by a source's crawl task when it has finished
 
 
-if __name__ == "__main__":
-    print("Starting INSEAD Event Scraper...")
+async def aiter_source_events(sources, dedup=None, known_fingerprints=None, stop_after_known_pages=0):
+    """
+    Crawls several sources concurrently and yields their events through one dedup index, as
+    aiter_unique_events does for a single source. Every source is crawled by its own task,
+    sharing the HTTP session, one rate limiter and FETCH_CONCURRENCY request slots, and each
+    stops on its own end-of-content and incremental checks. Events pass through a bounded
+    queue, so the crawl stays at most a few pages ahead of the consumer. Closing the generator
+    stops all crawls; a crawl error is re-raised once the other sources have stopped.
+    """
+    dedup = DedupIndex() if dedup is None else dedup
+    rate_limiter = TokenBucket(FETCH_RATE, FETCH_BURST)
+    semaphore = asyncio.Semaphore(max(FETCH_CONCURRENCY, 1))
+    output = asyncio.Queue(maxsize=max(FETCH_PREFETCH_PAGES, 1) * 50)
+
+    async def crawl(source):
+        events = aiter_unique_events(aiter_listing_pages(source, rate_limiter, semaphore), dedup,
+                                     known_fingerprints, stop_after_known_pages, source.name)
+        try:
+            async for event in events:
+                await output.put(event)
+        except Exception as e:
+            await output.put(e)
+        finally:
+            await events.aclose()
+        await output.put(_crawl_done)
+
+    tasks = [asyncio.ensure_future(crawl(source)) for source in sources]
+    error = None
+    running = len(tasks)
+    try:
+        while running:
+            item = await output.get()
+            if item is _crawl_done:
+                running -= 1
+            elif isinstance(item, Exception):
+                error = error or item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if error is not None:
+        raise error
+
+
+def fetch_all_events_hybrid(sources=None):
+    """
+    Fetches events from both the main page and iterates through all AJAX pages, for each
+    source (the main events listing by default).
+    Deduplicates and merges event data, returning the full list once the crawl is done.
+    """
+    async def crawl():
+        async for _ in aiter_source_events(sources or [DEFAULT_SOURCE], dedup):
+            pass
+
+    dedup = DedupIndex()
+    asyncio.run(crawl())
+    return dedup.events()
+
+
+def _dry_run_results(records, index, table):
+    # Results sync_airtable_records would report for records that differ from the index, without writing them
+    unique_field = table.fields['Event Unique ID']
+    results = {}
+    for record in records:
+        custom_unique_id = record['fields'][unique_field]
+        indexed_record = index.get(custom_unique_id) if index is not None else None
+        results[custom_unique_id] = {'custom_unique_id': custom_unique_id,
+                                     'status': 'updated' if indexed_record else 'created',
+                                     'record_id': indexed_record['id'] if indexed_record else None, 'error': None}
+    for result in results.values():
+        METRICS.inc('airtable_dry_run_records_total', status=result['status'], table=table.name)
+    return list(results.values())
+
+
+async def sync_routed_async(routed_records, indexes=None, dry_run=False):
+    """
+    Uploads an async stream of (table, record) pairs in one pass: each table keeps its own
+    batch, and indexes maps table name -> index from fetch_airtable_index (or None); records
+    matching their table's index are yielded as 'unchanged' without being buffered.
+    Full batches are uploaded in the default executor, up to AIRTABLE_CONCURRENCY at a time and
+    AIRTABLE_RATE requests per second, while the stream keeps flowing. A record whose event is
+    still being uploaded waits for that upload, so one event is never upserted twice at once.
+    With dry_run nothing is sent to Airtable: changed records are reported as 'created' or
+    'updated' according to the indexes, without record IDs.
+    Yields (table, result) pairs as uploads complete. If the upstream stream fails, the partial
+    batches are still uploaded before the error propagates, so everything crawled up to the
+    failure is synced.
+    """
+    indexes = indexes or {}
+    session = None if dry_run else get_airtable_session()
+    rate_limiter = TokenBucket(AIRTABLE_RATE, AIRTABLE_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(AIRTABLE_CONCURRENCY, 1))
+    batches = {}  # table name -> (table, records)
+    uploads = set()
+    in_flight = {}  # (table name, custom unique ID) -> upload task
+
+    async def upload(table, batch):
+        index = indexes.get(table.name)
+        if dry_run:
+            return table, _dry_run_results(batch, index, table)
+        async with semaphore:
+            await asyncio.to_thread(rate_limiter.acquire)
+            return table, await asyncio.to_thread(sync_airtable_records, batch, session, index, table)
+
+    def start_upload(table, batch):
+        task = asyncio.ensure_future(upload(table, batch))
+        uploads.add(task)
+        for record in batch:
+            in_flight[table.name, record['fields'][table.fields['Event Unique ID']]] = task
+
+    def finish(tasks):
+        for task in tasks:
+            uploads.discard(task)
+            table, results = task.result()
+            for result in results:
+                if in_flight.get((table.name, result['custom_unique_id'])) is task:
+                    del in_flight[table.name, result['custom_unique_id']]
+                yield table, result
+
+    try:
+        async for table, record in routed_records:
+            upload_task = in_flight.get((table.name, record['fields'][table.fields['Event Unique ID']]))
+            if upload_task is not None and not upload_task.done():
+                await asyncio.wait({upload_task})
+            index = indexes.get(table.name)
+            unchanged_result = _unchanged_result(record, index, table)
+            if unchanged_result:
+                METRICS.inc('airtable_records_total', status='unchanged', table=table.name)
+                yield table, unchanged_result
+                continue
+            batch = batches.setdefault(table.name, (table, []))[1]
+            batch.append(record)
+            if len(batch) >= AIRTABLE_BATCH_SIZE:
+                del batches[table.name]
+                start_upload(table, batch)
+                if len(uploads) > 2 * max(AIRTABLE_CONCURRENCY, 1): # Hold the stream until an upload finishes
+                    await asyncio.wait(uploads, return_when=asyncio.FIRST_COMPLETED)
+            for pair in finish([task for task in uploads if task.done()]):
+                yield pair
+    except Exception:
+        for table, batch in batches.values():
+            print(f"Crawl failed, uploading the {len(batch)} records for {table.name} collected so far before stopping...")
+            start_upload(table, batch)
+        if uploads:
+            await asyncio.wait(uploads)
+        raise
+    for table, batch in batches.values():
+        start_upload(table, batch)
+    while uploads:
+        done, _ = await asyncio.wait(uploads, return_when=asyncio.FIRST_COMPLETED)
+        for pair in finish(done):
+            yield pair
+
+
+async def _achain(*streams):
+    # Chains sync and async iterables into one async stream
+    for stream in streams:
+        if hasattr(stream, '__aiter__'):
+            async for item in stream:
+                yield item
+        else:
+            for item in stream:
+                yield item
+
 
-    # Call the hybrid function that fetches main page and iterates through all AJAX pages
-    events = fetch_all_events_hybrid()
+def _file_format(path, fmt=None):
+    return fmt or ('parquet' if path.endswith('.parquet') else 'ndjson')
 
-    print(f"\nFound a total of {len(events)} unique events. Processing for Airtable table {AIRTABLE_TABLE_ID}...")
 
+def _import_pyarrow():
+    # Parquet is optional; NDJSON needs nothing beyond the standard library
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet files need pyarrow (pip install pyarrow); use NDJSON instead.") from None
+    return pyarrow, pyarrow.parquet
+
+
+def write_events(events, path, fmt=None):
+    """
+    Writes events to an NDJSON file (one JSON object per line) or, for the 'parquet' format
+    or a .parquet path, a Parquet file with one column per event key.
+    """
+    if _file_format(path, fmt) == 'parquet':
+        pyarrow, parquet = _import_pyarrow()
+        keys = list(dict.fromkeys(key for event in events for key in event)) # Sources can stamp extra fields
+        parquet.write_table(pyarrow.table({key: [event.get(key) for event in events] for key in keys}), path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+def read_events(path, fmt=None):
+    """
+    Reads events written by write_events. Raises OSError or ValueError for unreadable files.
+    """
+    if _file_format(path, fmt) == 'parquet':
+        _, parquet = _import_pyarrow()
+        return parquet.read_table(path).to_pylist()
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_run_config():
+    """
+    Returns (sources, routes, synced_tables) for this run, or None after printing why the
+    configuration is unusable. routes maps source name -> list of AirtableTable and
+    synced_tables maps table name -> AirtableTable for every table some source syncs to.
+    """
     # IMPORTANT: You MUST replace 'fldXXXXXXX' in AIRTABLE_FIELDS['Event Unique ID']
     # with the actual field ID from your Airtable base for the "Event Unique ID" field.
     # Otherwise, Airtable updates will fail.
     if 'Event Unique ID' not in AIRTABLE_FIELDS or AIRTABLE_FIELDS['Event Unique ID'] == 'fldXXXXXXX':
         print("\nERROR: Please update 'AIRTABLE_FIELDS['Event Unique ID']' in the script with the actual field ID from your Airtable base.")
         print("This field is crucial for unique event identification in Airtable.")
+        return None
+    try:
+        sources, tables = load_sources()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"\nERROR: Invalid source configuration {SOURCES_PATH}: {e}")
+        return None
+    routes = {source.name: [tables[name] for name in source.tables] for source in sources}
+    synced_tables = {table.name: table for source_tables in routes.values() for table in source_tables}
+    return sources, routes, synced_tables
+
+
+def open_sync_state(synced_tables, dry_run=False):
+    """
+    Opens the event store (when configured and the default table is synced) and loads the
+    index of every synced table: from the store for the default table when it has synced
+    before, otherwise from Airtable unless AIRTABLE_USE_INDEX is off or this is a dry run.
+    Dry runs open an existing store read-only and skip a missing one, leaving no files behind.
+    Returns (store or None, indexes by table name), or (None, None) if an Airtable index could
+    not be loaded: without it every upsert would overwrite the table's 'Added At' values.
+    """
+    if not EVENT_STORE_PATH:
+        store = None
+    elif dry_run:
+        store = EventStore(EVENT_STORE_PATH, read_only=True) if os.path.exists(EVENT_STORE_PATH) else None
     else:
-        for i, event in enumerate(events, 1):
-            airtable_record = prepare_airtable_record(event)
+        store = EventStore(EVENT_STORE_PATH)
+    if store is not None and DEFAULT_TABLE_NAME not in synced_tables:
+        print(f"Warning: The event store journals the '{DEFAULT_TABLE_NAME}' table, which no source syncs to. Not using it.")
+        store.close()
+        store = None
+    indexes = {}
+    for table in synced_tables.values():
+        if table.name == DEFAULT_TABLE_NAME and store is not None and len(store):
+            # The store remembers what was synced in earlier runs, so Airtable need not be queried
+            indexes[table.name] = store.airtable_index()
+            print(f"\nLoaded {len(indexes[table.name])} synced events from the local event store {EVENT_STORE_PATH}.")
+        elif AIRTABLE_USE_INDEX and not dry_run:
+            print(f"\nLoading existing Airtable records of {table.name}...")
+            indexes[table.name] = fetch_airtable_index(airtable_index_field_keys(table), table=table)
+            if indexes[table.name] is None:
+                print(f"\nERROR: Could not load the existing records of {table.name}. Not syncing, so that their "
+                      "'Added At' values are kept (set AIRTABLE_USE_INDEX=0 to sync without the index).")
+                if store is not None:
+                    store.close()
+                return None, None
+            print(f"Indexed {len(indexes[table.name])} existing Airtable records.")
+    return store, indexes
 
-            # Ensure airtable_record is not None (e.g., if AIRTABLE_FIELDS was not correctly set up)
-            if airtable_record is None:
-                print(f"Skipping event {i} due to Airtable record preparation error.")
-                continue
 
-            print(f"\n{i}. Event Data (Airtable Format):")
-            print(f"    Title: {airtable_record['fields'].get(AIRTABLE_FIELDS['event'], 'N/A')}")
-            print(f"    Date: {airtable_record['fields'].get(AIRTABLE_FIELDS['Month & Day'], 'N/A')}")
-            print(f"    Location: {airtable_record['fields'].get(AIRTABLE_FIELDS['location'], 'N/A')}")
-            print(f"    URL: {airtable_record['fields'].get(AIRTABLE_FIELDS['eventurl'], 'N/A')}")
-            print(f"    Added At: {airtable_record['fields'].get(AIRTABLE_FIELDS['Added At'], 'N/A')}")
-            print(f"    Asia Related: {airtable_record['fields'].get(AIRTABLE_FIELDS['AsiaRelated'], 'N/A')}")
-            print(f"    Event Unique ID: {airtable_record['fields'].get(AIRTABLE_FIELDS['Event Unique ID'], 'N/A')}")
-
-            # Ensure eventurl and custom_unique_id are present before trying to manage in Airtable
-            if airtable_record['fields'].get(AIRTABLE_FIELDS['eventurl']) and \
-               airtable_record['fields'].get(AIRTABLE_FIELDS['Event Unique ID']):
-                manage_airtable_record(airtable_record)
-            else:
-                print(f"    ✗ Skipping event due to missing URL or Custom Unique ID: {airtable_record['fields'].get(AIRTABLE_FIELDS['event'], 'N/A')}")
+def incremental_fingerprints(store):
+    """
+    Returns the known fingerprints for an incremental crawl (custom unique ID -> fingerprint),
+    or None when this run should crawl everything.
+    """
+    if store is None or INCREMENTAL_STOP_PAGES <= 0:
+        return None
+    last_full_crawl = store.get_meta('last_full_crawl')
+    if FORCE_FULL_CRAWL or not last_full_crawl or \
+            datetime.now(timezone.utc) - datetime.fromisoformat(last_full_crawl) >= timedelta(days=FULL_CRAWL_EVERY_DAYS):
+        print(f"Running a full crawl (last full crawl: {last_full_crawl or 'never'}).")
+        return None
+    print(f"Incremental crawl: stopping after {INCREMENTAL_STOP_PAGES} consecutive pages of known events.")
+    return {custom_unique_id: indexed['fingerprint'] for custom_unique_id, indexed in store.airtable_index().items()}
+
+
+async def sync_events_async(events, routes, indexes, store=None, dry_run=False):
+    """
+    Journals an async stream of events in the store (if any), routes them to their tables and
+    uploads them with sync_routed_async, printing every event and result.
+    Returns the number of results per status.
+    """
+    default_tables = [default_airtable_table()]
+
+    async def routed_records():
+        i = 0
+        async for event in events:
+            if store is not None:
+                journal_event(event, store)
+            i += 1
+            for pair in _route_event(i, event, routes, default_tables):
+                yield pair
+
+    status_counts = dict.fromkeys(('created', 'updated', 'unchanged', 'failed'), 0)
+    async for table, result in sync_routed_async(routed_records(), indexes, dry_run):
+        if result['status'] == 'failed':
+            print(f"    ✗ Airtable API error in {table.name} for Unique ID {result['custom_unique_id']}: {result['error']}")
+        elif dry_run and result['status'] != 'unchanged':
+            print(f"    ○ Would {result['status'][:-1]} {table.name} record for Unique ID: {result['custom_unique_id']}")
+        elif result['status'] != 'unchanged':
+            print(f"    ✓ {result['status'].capitalize()} {table.name} record with ID: {result['record_id']} for Unique ID: {result['custom_unique_id']}")
+        if store is not None and table.name == DEFAULT_TABLE_NAME:
+            store.mark_result(result)
+        status_counts[result['status']] += 1
+    return status_counts
+
+
+_thread_profilers = [] # One per executor thread when PROFILE_PATH is set, merged into its stats by cli()
+
+
+def _profile_thread():
+    # Executor initializer: the HTTP calls, parsing and uploads all run in these threads,
+    # which a profiler enabled on the main thread does not see
+    import cProfile
+    profiler = cProfile.Profile()
+    _thread_profilers.append(profiler)
+    profiler.enable()
+
+
+def _use_executor(workers):
+    # Sizes the thread pool that runs the blocking HTTP calls of the asyncio pipeline
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, initializer=_profile_thread if PROFILE_PATH else None))
+
+
+def _exit_code(status_counts=None):
+    if METRICS.total('page_fetch_errors_total') or (status_counts and status_counts['failed']):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def _crawled_completely(sources):
+    # True if every source was crawled to the end of its listing without a failed page, so
+    # that the next runs may crawl incrementally
+    return METRICS.total('page_fetch_errors_total') == 0 and \
+        METRICS.total('listings_completed_total') >= len(sources)
+
+
+def _print_sync_summary(status_counts, dry_run, elapsed):
+    total = sum(status_counts.values())
+    print(f"Airtable sync{' (dry run, nothing written)' if dry_run else ''}: {status_counts['created']} created, "
+          f"{status_counts['updated']} updated, {status_counts['unchanged']} unchanged, {status_counts['failed']} failed "
+          f"in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} records/s).")
+
+
+async def crawl_command(args):
+    """
+    Crawls every source and writes the unique events to a file, without touching Airtable.
+    """
+    try:
+        sources, _ = load_sources()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"\nERROR: Invalid source configuration {SOURCES_PATH}: {e}")
+        return EXIT_ERROR
+    if _file_format(args.output, args.format) == 'parquet':
+        try:
+            _import_pyarrow()
+        except ValueError as e:
+            print(f"\nERROR: {e}")
+            return EXIT_ERROR
+    _use_executor(FETCH_CONCURRENCY + 1)
+    start = time.perf_counter()
+    dedup = DedupIndex()
+    async for _ in aiter_source_events(sources, dedup):
+        pass
+    events = dedup.events()
+    elapsed = time.perf_counter() - start
+    try:
+        write_events(events, args.output, args.format)
+    except (OSError, ValueError) as e:
+        print(f"\nERROR: Could not write {args.output}: {e}")
+        return EXIT_ERROR
+    print(f"\nCrawled {len(events)} unique events in {elapsed:.1f}s "
+          f"({len(events) / elapsed if elapsed else 0:.1f} events/s) and wrote them to {args.output}.")
+    return _exit_code()
+
 
-    print("\nScraping and Airtable synchronization complete!")
+async def sync_command(args):
+    """
+    Uploads the events of a file written by the crawl command, together with the events
+    the event store still has to sync.
+    """
+    config = load_run_config()
+    if config is None:
+        return EXIT_ERROR
+    _, routes, synced_tables = config
+    try:
+        events = read_events(args.input, args.format)
+    except (OSError, ValueError) as e:
+        print(f"\nERROR: Could not read events from {args.input}: {e}")
+        return EXIT_ERROR
+    print(f"Read {len(events)} events from {args.input}.")
+    _use_executor(AIRTABLE_CONCURRENCY + 1)
+
+    store, indexes = open_sync_state(synced_tables, args.dry_run)
+    if indexes is None:
+        return EXIT_ERROR
+    start = time.perf_counter()
+    try:
+        retries = store.unsynced_events() if store is not None and not args.dry_run else []
+        if retries:
+            print(f"Retrying {len(retries)} events whose upload failed or never completed in an earlier run.")
+        print(f"\nUploading events to Airtable tables {', '.join(synced_tables)} in batches of {AIRTABLE_BATCH_SIZE}...")
+        status_counts = await sync_events_async(_achain(retries, events), routes, indexes,
+                                                None if args.dry_run else store, args.dry_run)
+    finally:
+        if store is not None:
+            store.close()
+    _print_sync_summary(status_counts, args.dry_run, time.perf_counter() - start)
+    return _exit_code(status_counts)
+
+
+async def run_command(args):
+    """
+    Crawls the listings and streams the events into Airtable: each batch is written while
+    later pages are still being crawled.
+    """
+    config = load_run_config()
+    if config is None:
+        return EXIT_ERROR
+    sources, routes, synced_tables = config
+    if len(sources) > 1:
+        print(f"Crawling {len(sources)} sources: {', '.join(source.name for source in sources)}.")
+    _use_executor(FETCH_CONCURRENCY + AIRTABLE_CONCURRENCY + 1)
+
+    store, indexes = open_sync_state(synced_tables, args.dry_run)
+    if indexes is None:
+        return EXIT_ERROR
+    start = time.perf_counter()
+    dedup = DedupIndex()
+    try:
+        print(f"\nStreaming events to Airtable tables {', '.join(synced_tables)} in batches of {AIRTABLE_BATCH_SIZE}...")
+        known_fingerprints = incremental_fingerprints(store)
+        events = aiter_source_events(sources, dedup, known_fingerprints, INCREMENTAL_STOP_PAGES)
+        retries = store.unsynced_events() if store is not None and not args.dry_run else []
+        if retries:
+            print(f"Retrying {len(retries)} events whose upload failed or never completed in an earlier run.")
+        status_counts = await sync_events_async(_achain(retries, events), routes, indexes,
+                                                None if args.dry_run else store, args.dry_run)
+        if store is not None and known_fingerprints is None and not args.dry_run and _crawled_completely(sources):
+            store.set_meta('last_full_crawl', datetime.now(timezone.utc).isoformat())
+    finally:
+        if store is not None:
+            store.close()
+
+    print(f"\nFound a total of {len(dedup)} unique events.")
+    _print_sync_summary(status_counts, args.dry_run, time.perf_counter() - start)
+    return _exit_code(status_counts)
+
+
+COMMANDS = {'crawl': crawl_command, 'sync': sync_command, 'run': run_command}
+
+
+def _positive_float(value):
+    try:
+        return _positive_number(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    # Usage errors exit with EXIT_ERROR; argparse's own status 2 is EXIT_PARTIAL here
+
+    def error(self, message):
+        self.print_usage(sys.stderr)
+        self.exit(EXIT_ERROR, f"{self.prog}: error: {message}\n")
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line; without a command (or with only options) the 'run' command is used.
+    Exits with EXIT_ERROR on usage errors.
+    """
+    parser = _ArgumentParser(
+        prog='inseadevent.py', description="Crawls the INSEAD event listings and syncs them to Airtable.",
+        epilog=f"Exit codes: {EXIT_OK} success, {EXIT_ERROR} bad configuration or input or a failed run, "
+               f"{EXIT_PARTIAL} completed with pages that could not be fetched or records that were not synced.")
+    crawl_options = argparse.ArgumentParser(add_help=False)
+    crawl_options.add_argument('--concurrency', type=int,
+                               help=f"listing requests in flight at once (default {FETCH_CONCURRENCY})")
+    crawl_options.add_argument('--rate', type=_positive_float,
+                               help=f"listing requests started per second (default {FETCH_RATE:g})")
+    sync_options = argparse.ArgumentParser(add_help=False)
+    sync_options.add_argument('--dry-run', action='store_true',
+                              help="compare with the known Airtable records but write nothing to Airtable or the event store")
+    file_options = argparse.ArgumentParser(add_help=False)
+    file_options.add_argument('--format', choices=('ndjson', 'parquet'),
+                              help="file format (default: parquet for .parquet paths, else ndjson)")
+
+    commands = parser.add_subparsers(dest='command', metavar='{crawl,sync,run}')
+    crawl = commands.add_parser('crawl', parents=[crawl_options, file_options],
+                                help="crawl the listings and write the events to a file")
+    crawl.add_argument('-o', '--output', default='events.ndjson', help="output file (default events.ndjson)")
+    sync = commands.add_parser('sync', parents=[sync_options, file_options],
+                               help="upload the events of a file written by crawl")
+    sync.add_argument('input', help="NDJSON or Parquet file of events")
+    sync.add_argument('--concurrency', type=int,
+                      help=f"Airtable batches uploaded at once (default {AIRTABLE_CONCURRENCY})")
+    commands.add_parser('run', parents=[crawl_options, sync_options],
+                        help="crawl and sync in one streaming pass (the default)")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv = ['run'] + argv
+    return parser.parse_args(argv)
+
+
+def apply_options(args):
+    """
+    Applies the --concurrency and --rate options over the environment settings.
+    """
+    global FETCH_CONCURRENCY, FETCH_PREFETCH_PAGES, FETCH_RATE, AIRTABLE_CONCURRENCY
+    if args.concurrency is not None and args.command == 'sync':
+        AIRTABLE_CONCURRENCY = max(args.concurrency, 1)
+    elif args.concurrency is not None:
+        FETCH_CONCURRENCY = max(args.concurrency, 1)
+        if "INSEAD_PREFETCH_PAGES" not in os.environ:
+            FETCH_PREFETCH_PAGES = FETCH_CONCURRENCY
+    if getattr(args, 'rate', None) is not None:
+        FETCH_RATE = args.rate
+
+
+def write_run_outputs():
+    """
+    Writes the JSON run report and the optional Prometheus textfile.
+    """
+    if RUN_REPORT_PATH:
+        METRICS.write_report(RUN_REPORT_PATH)
+        print(f"Run report written to {RUN_REPORT_PATH}.")
+    if PROMETHEUS_TEXTFILE:
+        METRICS.write_prometheus(PROMETHEUS_TEXTFILE)
+
+
+def main(args=None):
+    """
+    Runs a command given by the parsed command line (parse_args() by default).
+    Returns the exit code.
+    """
+    args = parse_args() if args is None else args
+    apply_options(args)
+    print("Starting INSEAD Event Scraper...")
+    exit_code = asyncio.run(COMMANDS[args.command](args))
+    if exit_code == EXIT_OK:
+        print("\nScraping and Airtable synchronization complete!")
+    elif exit_code == EXIT_PARTIAL:
+        print("\nFinished, but some listing pages or records failed; see the errors above.")
+    return exit_code
+
+
+def cli():
+    """
+    Runs main() as a program: profiles it when PROFILE_PATH is set (the event loop and the
+    executor threads, merged into one stats file), writes the run outputs and exits with its
+    exit code. Also the entry point of the zipapp (see build_zipapp.py).
+    --help and usage errors exit before anything runs, leaving the last run report in place.
+    """
+    args = parse_args()
+    profiler = None
+    if PROFILE_PATH:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        exit_code = main(args)
+    finally:
+        if profiler:
+            import pstats
+            profiler.disable()
+            stats = pstats.Stats(profiler)
+            for thread_profiler in _thread_profilers: # Their threads have exited with asyncio.run()
+                stats.add(thread_profiler)
+            stats.dump_stats(PROFILE_PATH)
+        write_run_outputs()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,168 @@
+"""
+Run instrumentation for the scraper: counters, latency histograms and stage timings,
+written out at the end of a run as a JSON report and optionally as a Prometheus
+textfile (for node_exporter's textfile collector).
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, math.inf)
+COUNT_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 500, math.inf)
+MAX_SAMPLES = 10000  # Samples kept per histogram for the report's percentiles
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram that also keeps up to MAX_SAMPLES raw samples for percentiles.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = []
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] if ordered else None
+
+        return {'count': self.count, 'sum': round(self.sum, 6),
+                'min': ordered[0] if ordered else None, 'max': ordered[-1] if ordered else None,
+                'p50': percentile(0.5), 'p90': percentile(0.9), 'p99': percentile(0.99)}
+
+
+def _key(name, labels):
+    # Label values are strings in the report, so that e.g. reason=429 and reason='Timeout' sort together
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _series_name(name, labels):
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class RunMetrics:
+    """
+    Thread-safe collection of counters and histograms for one run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+
+    def inc(self, name, amount=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def total(self, name):
+        """
+        Returns the sum of a counter over all its label sets.
+        """
+        with self._lock:
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Context manager recording the duration of a stage in the stage_seconds histogram.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, stage=stage)
+
+    def timed(self, stage):
+        """
+        Decorator recording every call of a function under the given stage name.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def response_hook(self, response, *args, **kwargs):
+        """
+        requests response hook recording latency, bytes and status of every HTTP response.
+        """
+        host = response.url.split('/')[2] if '://' in response.url else ''
+        self.observe('http_request_seconds', response.elapsed.total_seconds(), host=host)
+        self.inc('http_responses_total', host=host, status=response.status_code)
+        self.inc('http_response_bytes_total', len(response.content or b''), host=host)
+        return response
+
+    def report(self):
+        """
+        Returns the machine-readable run report as a dict.
+        """
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now(timezone.utc).isoformat(),
+                'wall_time_seconds': round(time.perf_counter() - self._start, 6),
+                'counters': {_series_name(name, labels): value for (name, labels), value in sorted(self.counters.items())},
+                'histograms': {_series_name(name, labels): histogram.summary()
+                               for (name, labels), histogram in sorted(self.histograms.items())}
+            }
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path, prefix='inseadevent_'):
+        """
+        Writes all metrics in the Prometheus text exposition format, atomically.
+        """
+        lines = [f'{prefix}run_wall_time_seconds {time.perf_counter() - self._start:.6f}']
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                lines.append(f'{_series_name(prefix + name, labels)} {value}')
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f'{_series_name(prefix + name + "_bucket", labels + (("le", le),))} {cumulative}')
+                lines.append(f'{_series_name(prefix + name + "_sum", labels)} {histogram.sum:.6f}')
+                lines.append(f'{_series_name(prefix + name + "_count", labels)} {histogram.count}')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(path + '.tmp', path)
+
+
+METRICS = RunMetrics()